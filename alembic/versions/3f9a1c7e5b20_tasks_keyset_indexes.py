@@ -0,0 +1,71 @@
+"""tasks_keyset_indexes
+
+Revision ID: 3f9a1c7e5b20
+Revises: df3112de3b49
+Create Date: 2026-10-17 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e5b20'
+down_revision: Union[str, Sequence[str], None] = 'df3112de3b49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_Tasks_user_id_task_id',
+            'Tasks',
+            ['user_id', 'task_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_Tasks_user_id_name_task_id',
+            'Tasks',
+            ['user_id', 'name', 'task_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_Tasks_user_id_pomodoro_count_task_id',
+            'Tasks',
+            ['user_id', 'pomodoro_count', 'task_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_Tasks_user_id_pomodoro_count_task_id',
+            table_name='Tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_Tasks_user_id_name_task_id',
+            table_name='Tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_Tasks_user_id_task_id',
+            table_name='Tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,57 @@
+"""user_profile_lookup_indexes
+
+Revision ID: a7d4e2b91c3f
+Revises: 3f9a1c7e5b20
+Create Date: 2026-10-17 13:40:05.771902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e2b91c3f'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7e5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_user_profile_email'),
+            'user_profile',
+            ['email'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_user_profile_google_access_token'),
+            'user_profile',
+            ['google_access_token'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_user_profile_google_access_token'),
+            table_name='user_profile',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f('ix_user_profile_email'),
+            table_name='user_profile',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,77 @@
+"""Helpers shared by the benchmark scripts."""
+import math
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+from uuid import UUID
+
+from fastapi import APIRouter, FastAPI
+from fakeredis import TcpFakeServer
+
+from dependency import (
+    get_container,
+    get_readonly_task_service,
+    get_request_user_id,
+    get_settings,
+)
+from service import TaskService
+from settings import Settings
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of samples, nearest-rank method."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def report_latency(name: str, samples: Sequence[float]) -> None:
+    """Print p50/p99 of latencies given in seconds."""
+    print(
+        f"{name:<24} n={len(samples):<6} "
+        f"p50={percentile(samples, 50) * 1000:7.3f} ms  "
+        f"p99={percentile(samples, 99) * 1000:7.3f} ms"
+    )
+
+
+@contextmanager
+def fake_redis_server(host: str = "127.0.0.1") -> Iterator[tuple[str, int]]:
+    """Serve an in-memory Redis over TCP on a free port for the duration of the block.
+
+    Slower than a real Redis, but it speaks the same protocol over a real
+    socket, so connection setup and teardown costs are still paid.
+    """
+    server = TcpFakeServer((host, 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[0], server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def build_task_app(
+    router: APIRouter, user_id: UUID, get_task_service: Callable[..., TaskService]
+) -> FastAPI:
+    """Serve router as user_id, with the given task service and no rate limiting."""
+    settings = Settings(RATE_LIMIT_ENABLED=False)
+
+    async def no_container() -> None:
+        return None
+
+    async def get_benchmark_settings() -> Settings:
+        return settings
+
+    async def get_benchmark_user_id() -> UUID:
+        return user_id
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides = {
+        get_container: no_container,
+        get_settings: get_benchmark_settings,
+        get_request_user_id: get_benchmark_user_id,
+        get_readonly_task_service: get_task_service,
+    }
+    return app
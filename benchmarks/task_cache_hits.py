@@ -0,0 +1,112 @@
+"""Throughput of GET /task/all on cache hits: raw JSON passthrough vs validation.
+
+The passthrough route is the real handler, which joins the cached task
+documents into the response body. The validating route reproduces the
+previous behaviour: tasks are parsed into TaskResponse objects, validated
+again against response_model and serialized by FastAPI. Both take the same
+dependencies and parameters, so only the handling of the body differs.
+
+Redis is faked in-process, so the numbers are dominated by the work done in
+the worker. The local tier is disabled unless --local is given.
+
+Usage:
+    python -m benchmarks.task_cache_hits [--requests N] [--local]
+"""
+import argparse
+import asyncio
+import time
+from typing import Annotated
+from uuid import UUID, uuid4
+
+import httpx
+from fakeredis import FakeAsyncRedis
+from fastapi import APIRouter, Depends, FastAPI, Query, Request
+
+from benchmarks.common import build_task_app, report_latency
+from cache import LocalTaskCache
+from dependency import get_readonly_task_service, get_request_user_id, rate_limit
+from handlers.tasks import router
+from repository import TaskCache, TaskRepository
+from schema import TaskPage, TaskQuery, TaskResponse
+from service import TaskService
+
+
+SIZES = (10, 100, 1_000)
+
+validating_router = APIRouter(prefix="/task")
+
+
+@validating_router.get(
+    "/all",
+    response_model=list[TaskResponse] | TaskPage,
+    dependencies=[Depends(rate_limit("task:list", read=True))],
+)
+async def get_tasks_validated(
+    request: Request,
+    task_service: Annotated[TaskService, Depends(get_readonly_task_service)],
+    query: Annotated[TaskQuery, Query()],
+    user_id: UUID = Depends(get_request_user_id),
+):
+    return await task_service.get_user_tasks(user_id)
+
+
+async def measure(app: FastAPI, requests: int) -> list[float]:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/task/all")
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+    return latencies
+
+
+async def run(requests: int, local: bool) -> None:
+    for size in SIZES:
+        user_id = uuid4()
+        task_cache = TaskCache(
+            FakeAsyncRedis(),
+            local_cache=LocalTaskCache(max_entries=100, max_bytes=64 * 1024 * 1024, ttl=60)
+            if local
+            else None,
+            early_refresh_beta=0,
+        )
+        await task_cache.set_users_task(
+            user_id=user_id,
+            tasks=[
+                TaskResponse(
+                    task_id=uuid4(),
+                    name=f"task {i}",
+                    pomodoro_count=i % 8,
+                    category_id=None,
+                    user_id=user_id,
+                )
+                for i in range(size)
+            ],
+        )
+
+        def get_task_service() -> TaskService:
+            return TaskService(task_repository=TaskRepository(), task_cache=task_cache)
+
+        variants = {
+            "validated": build_task_app(validating_router, user_id, get_task_service),
+            "passthrough": build_task_app(router, user_id, get_task_service),
+        }
+        for name, app in variants.items():
+            await measure(app, min(requests, 50))
+            latencies = await measure(app, requests)
+            report_latency(f"{size} tasks, {name}", latencies)
+            print(f"{'':<24} {len(latencies) / sum(latencies):,.0f} requests/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--local", action="store_true", help="enable the in-process tier")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.local))
+
+
+if __name__ == "__main__":
+    main()
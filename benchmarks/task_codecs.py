@@ -0,0 +1,106 @@
+"""Encode/decode time and size of cached task lists per TaskCache codec.
+
+For 10, 1k and 50k tasks per user, measures encoding every task into its
+hash field, decoding the fields back into the JSON array served on a hit,
+and parsing that array into TaskResponse objects. Size is the total of the
+stored field values; with --redis the Redis configured by Settings is also
+filled and its MEMORY USAGE of the user's hash reported.
+
+Usage:
+    python -m benchmarks.task_codecs [--redis] [--repeat N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+
+from cache import CompactTaskCodec, JsonTaskCodec, TaskCodec
+from repository import TaskCache
+from schema import TaskResponse
+from settings import settings
+
+
+SIZES = (10, 1_000, 50_000)
+
+_task_list_adapter = TypeAdapter(list[TaskResponse])
+
+
+def make_tasks(count: int) -> list[TaskResponse]:
+    user_id = uuid4()
+    categories = [uuid4() for _ in range(5)]
+    return [
+        TaskResponse(
+            task_id=uuid4(),
+            name=f"Task number {i} of the current sprint",
+            pomodoro_count=i % 8,
+            category_id=categories[i % 6] if i % 6 < 5 else None,
+            user_id=user_id,
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def redis_memory_usage(codec: TaskCodec, tasks: list[TaskResponse]) -> int:
+    redis = aioredis.Redis(
+        host=settings.CACHE_HOST, port=settings.CACHE_PORT, db=settings.CACHE_DB
+    )
+    try:
+        task_cache = TaskCache(redis, codec=codec)
+        user_id = tasks[0].user_id
+        await task_cache.set_users_task(user_id=user_id, tasks=tasks)
+        usage = await redis.memory_usage(task_cache._hash_key(user_id), samples=0)
+        await task_cache.invalidate_user_cache(user_id)
+        return usage
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis", action="store_true", help="report Redis MEMORY USAGE")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs: dict[str, TaskCodec] = {
+        "json": JsonTaskCodec(),
+        "compact": CompactTaskCodec(compress_threshold=settings.CACHE_COMPRESS_THRESHOLD),
+    }
+    print(
+        f"{'tasks':>6} {'codec':<8} {'encode ms':>10} {'decode ms':>10} "
+        f"{'parse ms':>10} {'bytes':>10}" + (f" {'redis bytes':>12}" if args.redis else "")
+    )
+    for size in SIZES:
+        tasks = make_tasks(size)
+        for name, codec in codecs.items():
+            fields = [codec.encode_task(task) for task in tasks]
+            payload = b"[" + b",".join(codec.decode_task_json(field) for field in fields) + b"]"
+            encode = best_of(args.repeat, lambda: [codec.encode_task(task) for task in tasks])
+            decode = best_of(
+                args.repeat,
+                lambda: b"[" + b",".join(codec.decode_task_json(field) for field in fields) + b"]",
+            )
+            parse = best_of(args.repeat, lambda: _task_list_adapter.validate_json(payload))
+            line = (
+                f"{size:>6} {name:<8} {encode * 1000:>10.2f} {decode * 1000:>10.2f} "
+                f"{parse * 1000:>10.2f} {sum(map(len, fields)):>10}"
+            )
+            if args.redis:
+                line += f" {asyncio.run(redis_memory_usage(codec, tasks)):>12}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Latency of GET /task/all on cache hits: Redis client per request vs shared pool.
+
+Before the worker-wide pool, every request built its own Redis client and
+closed it after the cache call, so each hit paid a TCP connect and teardown.
+Both variants are served by the real handler and TaskService; the local
+in-process tier is disabled so every request reaches Redis.
+
+Usage:
+    python -m benchmarks.task_list_latency [--fake-redis] [--requests N] [--concurrency C]
+
+Without --fake-redis the Redis configured by Settings is used. The in-process
+fake answers every command far slower than a real Redis, so only the
+difference between the variants is meaningful with it.
+"""
+import argparse
+import asyncio
+import time
+from contextlib import nullcontext
+from uuid import uuid4
+
+import httpx
+from fastapi import Depends, FastAPI
+from redis import asyncio as aioredis
+
+from benchmarks.common import build_task_app, fake_redis_server, report_latency
+from handlers.tasks import router
+from repository import TaskCache, TaskRepository
+from schema import TaskResponse
+from service import TaskService
+from settings import settings
+
+
+USER_ID = uuid4()
+
+
+def build_app(get_task_cache) -> FastAPI:
+    def get_task_service(task_cache: TaskCache = Depends(get_task_cache)) -> TaskService:
+        return TaskService(task_repository=TaskRepository(), task_cache=task_cache)
+
+    return build_task_app(router, USER_ID, get_task_service)
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> list[float]:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/task/all")
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+async def run(host: str, port: int, tasks: int, requests: int, concurrency: int) -> None:
+    pool = aioredis.BlockingConnectionPool(
+        host=host,
+        port=port,
+        max_connections=settings.CACHE_POOL_SIZE,
+        timeout=settings.CACHE_POOL_TIMEOUT,
+        socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+    )
+    pooled_cache = TaskCache(aioredis.Redis(connection_pool=pool), early_refresh_beta=0)
+    await pooled_cache.set_users_task(
+        user_id=USER_ID,
+        tasks=[
+            TaskResponse(
+                task_id=uuid4(),
+                name=f"task {i}",
+                pomodoro_count=i,
+                category_id=None,
+                user_id=USER_ID,
+            )
+            for i in range(tasks)
+        ],
+    )
+
+    async def per_request_cache():
+        redis = aioredis.Redis(host=host, port=port, socket_timeout=settings.CACHE_SOCKET_TIMEOUT)
+        try:
+            yield TaskCache(redis, early_refresh_beta=0)
+        finally:
+            await redis.aclose()
+
+    variants = {
+        "client per request": build_app(per_request_cache),
+        "shared pool": build_app(lambda: pooled_cache),
+    }
+    for name, app in variants.items():
+        await measure(app, min(requests, 100), concurrency)
+        report_latency(name, await measure(app, requests, concurrency))
+    await pool.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fake-redis", action="store_true", help="serve Redis in-process")
+    parser.add_argument("--tasks", type=int, default=50, help="cached tasks of the user")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    server = fake_redis_server() if args.fake_redis else nullcontext(
+        (settings.CACHE_HOST, settings.CACHE_PORT)
+    )
+    with server as (host, port):
+        asyncio.run(run(host, port, args.tasks, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
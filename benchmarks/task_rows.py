@@ -0,0 +1,106 @@
+"""Rows per second of building a user's task list on a cache miss.
+
+Compares the ORM path, which hydrates Task instances and validates each
+with TaskResponse.model_validate(from_attributes), against selecting only
+the TaskResponse columns as plain rows with SQLAlchemy Core. Rows are
+turned into responses either one by one with model_construct, or in one
+batch by the TypeAdapter call TaskService uses.
+
+A temporary user with --tasks tasks is created in the database configured
+by Settings and deleted afterwards.
+
+Usage:
+    python -m benchmarks.task_rows [--tasks N] [--repeat N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, insert
+
+from database import AsyncSessionFactory, engine
+from models import Task, UserProfile
+from repository import TaskRepository
+from schema import TaskResponse
+from service.task import _tasks_from_rows
+
+
+async def create_user_with_tasks(count: int) -> UUID:
+    async with AsyncSessionFactory() as session:
+        user = UserProfile(username=f"benchmark-{uuid4()}")
+        session.add(user)
+        await session.flush()
+        await session.execute(
+            insert(Task),
+            [
+                {"name": f"task {i}", "pomodoro_count": i % 8, "user_id": user.user_id}
+                for i in range(count)
+            ],
+        )
+        await session.commit()
+        return user.user_id
+
+
+async def delete_user(user_id: UUID) -> None:
+    async with AsyncSessionFactory() as session:
+        await session.execute(delete(Task).where(Task.user_id == user_id))
+        await session.execute(delete(UserProfile).where(UserProfile.user_id == user_id))
+        await session.commit()
+
+
+async def best_of(repeat: int, load: Callable[[], Awaitable[list]]) -> tuple[float, int]:
+    timings, rows = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(await load())
+        timings.append(time.perf_counter() - started)
+    return min(timings), rows
+
+
+async def run(tasks: int, repeat: int) -> None:
+    repository = TaskRepository()
+    user_id = await create_user_with_tasks(tasks)
+    try:
+
+        async def orm() -> list[TaskResponse]:
+            return [
+                TaskResponse.model_validate(task)
+                for task in await repository.get_user_tasks(user_id)
+            ]
+
+        async def core_construct() -> list[TaskResponse]:
+            rows = await repository.get_user_task_rows(user_id)
+            return [TaskResponse.model_construct(**row._mapping) for row in rows]
+
+        async def core_batch() -> list[TaskResponse]:
+            return _tasks_from_rows(await repository.get_user_task_rows(user_id))
+
+        variants = {
+            "orm + model_validate": orm,
+            "core + model_construct": core_construct,
+            "core + batch validate": core_batch,
+        }
+        for name, load in variants.items():
+            await load()
+            seconds, rows = await best_of(repeat, load)
+            print(
+                f"{name:<24} {rows} rows in {seconds * 1000:8.2f} ms  "
+                f"{rows / seconds:>12,.0f} rows/s"
+            )
+    finally:
+        await delete_user(user_id)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
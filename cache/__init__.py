@@ -1,4 +1,41 @@
-from cache.accessor import get_redis_connection
+from cache.accessor import (
+    get_redis_connection,
+    get_pubsub_connection,
+    init_redis_pool,
+    close_redis_pool,
+)
+from cache.codec import TaskCodec, JsonTaskCodec, CompactTaskCodec, get_task_codec
+from cache.local import LocalTaskCache, local_task_cache
+from cache.invalidation import INVALIDATION_CHANNEL, listen_for_invalidations
+from cache.token import VerifiedTokenCache, verified_token_cache
+from cache.rate_limit import RateLimiter, RateLimitResult
+from cache.stats import (
+    RequestCacheStats,
+    start_request_cache_stats,
+    get_request_cache_stats,
+    observe_redis,
+)
 
 
-__all__ = ["get_redis_connection"]
+__all__ = [
+    "get_redis_connection",
+    "get_pubsub_connection",
+    "init_redis_pool",
+    "close_redis_pool",
+    "TaskCodec",
+    "JsonTaskCodec",
+    "CompactTaskCodec",
+    "get_task_codec",
+    "LocalTaskCache",
+    "local_task_cache",
+    "INVALIDATION_CHANNEL",
+    "listen_for_invalidations",
+    "VerifiedTokenCache",
+    "verified_token_cache",
+    "RateLimiter",
+    "RateLimitResult",
+    "RequestCacheStats",
+    "start_request_cache_stats",
+    "get_request_cache_stats",
+    "observe_redis",
+]
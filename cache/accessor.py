@@ -4,8 +4,63 @@ from settings import Settings
 
 settings = Settings()
 
+_redis_pool: aioredis.ConnectionPool | None = None
 
-def get_redis_connection() -> aioredis.Redis:
+
+def init_redis_pool() -> aioredis.ConnectionPool:
+    """Create the worker-wide Redis connection pool.
+
+    Must be called from the application lifespan so that every gunicorn
+    worker owns its own pool instead of inheriting sockets from the master.
+
+    Returns:
+        ConnectionPool: Shared pool used by all Redis clients of this worker
+    """
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = aioredis.BlockingConnectionPool(
+            host=settings.CACHE_HOST,
+            port=settings.CACHE_PORT,
+            db=settings.CACHE_DB,
+            max_connections=settings.CACHE_POOL_SIZE,
+            timeout=settings.CACHE_POOL_TIMEOUT,
+            socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=settings.CACHE_HEALTH_CHECK_INTERVAL,
+        )
+    return _redis_pool
+
+
+async def close_redis_pool() -> None:
+    """Disconnect all pooled Redis connections on application shutdown."""
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.aclose()
+        _redis_pool = None
+
+
+def get_pubsub_connection() -> aioredis.Redis:
+    """Return a Redis client with its own connection for pub/sub.
+
+    A subscription holds its connection for the whole lifetime of the worker
+    and sits idle between messages, so it must neither take a slot from the
+    shared pool nor use its socket timeout. Dead connections are detected by
+    the health-check PINGs instead. The caller closes the client.
+    """
     return aioredis.Redis(
-        host=settings.CACHE_HOST, port=settings.CACHE_PORT, db=settings.CACHE_DB
+        host=settings.CACHE_HOST,
+        port=settings.CACHE_PORT,
+        db=settings.CACHE_DB,
+        socket_timeout=None,
+        socket_connect_timeout=settings.CACHE_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.CACHE_HEALTH_CHECK_INTERVAL,
     )
+
+
+def get_redis_connection() -> aioredis.Redis:
+    """Return a Redis client bound to the shared connection pool.
+
+    The client is cheap to build: it only borrows connections from the pool
+    for the duration of a command and never closes the pool itself.
+    """
+    return aioredis.Redis(connection_pool=init_redis_pool())
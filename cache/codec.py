@@ -0,0 +1,127 @@
+import zlib
+from functools import lru_cache
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from schema import TaskResponse
+
+
+class TaskCodec(ABC):
+    """Serialization format of cached tasks in Redis.
+
+    Every task is stored as its own field of the user's hash.
+    """
+
+    @abstractmethod
+    def encode_task(self, task: TaskResponse) -> bytes:
+        """Serialize a single task."""
+
+    @abstractmethod
+    def encode_task_json(self, document: bytes) -> bytes:
+        """Store a task that is already serialized as a JSON document."""
+
+    @abstractmethod
+    def decode_task_json(self, payload: bytes) -> Optional[bytes]:
+        """Extract the JSON document of a stored task without parsing it.
+
+        Returns:
+            Optional[bytes]: JSON document, or None if the payload is in a
+            format this codec can't read and must be treated as a miss
+        """
+
+
+class JsonTaskCodec(TaskCodec):
+    """Original format: plain JSON documents without a header.
+
+    Anything that isn't a JSON object, such as an entry written by
+    CompactTaskCodec before a rollback, can't be read and counts as a miss.
+    """
+
+    def encode_task(self, task: TaskResponse) -> bytes:
+        return task.model_dump_json().encode("utf-8")
+
+    def encode_task_json(self, document: bytes) -> bytes:
+        return document
+
+    def decode_task_json(self, payload: bytes) -> Optional[bytes]:
+        return payload if payload.startswith(b"{") else None
+
+
+# Preset dictionary of the compact format: the hex digits, the keys and the
+# punctuation every TaskResponse document shares. Deflate can refer back to
+# it from the first byte, which is what makes compressing a single task of
+# ~200 bytes worthwhile. It is part of the stored format: changing it
+# requires a new CompactTaskCodec.VERSION.
+TASK_DICTIONARY = (
+    b'0123456789abcdef-{"name":"","pomodoro_count":,"category_id":null,'
+    b'"category_id":"","task_id":"","user_id":""}'
+)
+
+
+class CompactTaskCodec(TaskCodec):
+    """Compact format: versioned JSON, deflated against a preset dictionary.
+
+    Layout: ``MAGIC | version (1 byte) | flags (1 byte) | body``. In version 2
+    the body is raw deflate against TASK_DICTIONARY when ``FLAG_DEFLATE`` is
+    set, and plain JSON otherwise. Version 1 entries, zlib-compressed when
+    ``FLAG_ZLIB`` is set, are still read.
+    """
+
+    MAGIC = b"PT"
+    VERSION = 2
+    SUPPORTED_VERSIONS = frozenset({1, 2})
+    FLAG_ZLIB = 0x01
+    FLAG_DEFLATE = 0x02
+    HEADER_SIZE = len(MAGIC) + 2
+
+    def __init__(self, compress_threshold: int = 64, compress_level: int = 1):
+        """
+        Args:
+            compress_threshold: Size in bytes of a task's JSON above which it is compressed
+            compress_level: zlib compression level
+        """
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def _pack(self, body: bytes) -> bytes:
+        flags = 0
+        if len(body) > self.compress_threshold:
+            compressor = zlib.compressobj(
+                self.compress_level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=TASK_DICTIONARY
+            )
+            compressed = compressor.compress(body) + compressor.flush()
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= self.FLAG_DEFLATE
+        return self.MAGIC + bytes((self.VERSION, flags)) + body
+
+    def _unpack(self, payload: bytes) -> Optional[bytes]:
+        if len(payload) < self.HEADER_SIZE or not payload.startswith(self.MAGIC):
+            return None
+        version, flags = payload[len(self.MAGIC)], payload[len(self.MAGIC) + 1]
+        if version not in self.SUPPORTED_VERSIONS:
+            return None
+        body = payload[self.HEADER_SIZE:]
+        if flags & self.FLAG_DEFLATE:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=TASK_DICTIONARY)
+            return decompressor.decompress(body) + decompressor.flush()
+        if flags & self.FLAG_ZLIB:
+            return zlib.decompress(body)
+        return body
+
+    def encode_task(self, task: TaskResponse) -> bytes:
+        return self._pack(task.model_dump_json().encode("utf-8"))
+
+    def encode_task_json(self, document: bytes) -> bytes:
+        return self._pack(document)
+
+    def decode_task_json(self, payload: bytes) -> Optional[bytes]:
+        return self._unpack(payload)
+
+
+@lru_cache
+def get_task_codec(name: str, compress_threshold: int = 64) -> TaskCodec:
+    """Return the shared task codec configured by name ("json" or "compact")."""
+    if name == "compact":
+        return CompactTaskCodec(compress_threshold=compress_threshold)
+    return JsonTaskCodec()
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from cache.local import LocalTaskCache
+
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "task_cache:invalidate"
+
+
+async def listen_for_invalidations(
+    redis: aioredis.Redis,
+    local_cache: LocalTaskCache,
+    retry_delay: float = 1.0,
+    poll_timeout: float = 1.0,
+) -> None:
+    """Evict local cache entries announced on the invalidation channel.
+
+    Runs for the whole lifetime of a worker. Messages carry the user ID whose
+    tasks changed. While the subscription is down, messages may be lost, so
+    the whole local cache is dropped when the connection fails and again
+    once it has been re-established.
+
+    Args:
+        redis: Redis client with a dedicated connection and no socket timeout
+        local_cache: In-process cache to keep coherent
+        retry_delay: Pause before resubscribing after a connection error
+        poll_timeout: How long one read waits for a message. Idle reads just
+            loop, which lets the client send its health-check PINGs.
+    """
+    reconnecting = False
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if reconnecting:
+                    local_cache.clear()
+                    reconnecting = False
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=poll_timeout
+                    )
+                    if message is None or message["type"] != "message":
+                        continue
+                    try:
+                        local_cache.invalidate(UUID(message["data"].decode("utf-8")))
+                    except ValueError:
+                        local_cache.clear()
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError) as e:
+            logger.warning("Task cache invalidation listener failed: %s", e)
+            local_cache.clear()
+            reconnecting = True
+            await asyncio.sleep(retry_delay)
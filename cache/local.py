@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from settings import settings
+
+
+class LocalTaskCache:
+    """Per-worker in-process TTL + LRU cache of user task lists.
+
+    Sits in front of Redis so repeated reads of the same user from one worker
+    skip the network round trip. Lists are kept as their serialized JSON
+    array, ready to be sent as a response body. Bounded both by entry count
+    and by the total size of the cached payloads.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        """
+        Args:
+            max_entries: Maximum number of cached users
+            max_bytes: Maximum total size of cached payloads in bytes
+            ttl: Entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[UUID, tuple[float, int, bytes]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, user_id: UUID) -> Optional[bytes]:
+        """Return the cached JSON array of user's tasks, or None on miss or expiry."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, payload = entry
+        if expires_at <= time.monotonic():
+            self._pop(user_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return payload
+
+    def set(self, user_id: UUID, payload: bytes) -> None:
+        """Cache tasks of the user, evicting least recently used entries if needed.
+
+        Args:
+            user_id: User ID
+            payload: JSON array of the user's tasks
+        """
+        size = len(payload)
+        self._pop(user_id)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        while self._entries and (
+            len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._pop(oldest)
+            self.evictions += 1
+        self._entries[user_id] = (time.monotonic() + self.ttl, size, payload)
+        self._bytes += size
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached tasks of the user."""
+        if self._pop(user_id):
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _pop(self, user_id: UUID) -> bool:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+
+
+local_task_cache = LocalTaskCache(
+    max_entries=settings.LOCAL_CACHE_MAX_ENTRIES,
+    max_bytes=settings.LOCAL_CACHE_MAX_BYTES,
+    ttl=settings.LOCAL_CACHE_TTL,
+)
@@ -0,0 +1,84 @@
+import math
+from typing import NamedTuple
+
+from redis import asyncio as aioredis
+
+
+# Token bucket refilled continuously at ARGV[2] tokens per second up to
+# ARGV[1] tokens. Takes ARGV[3] tokens if available. Uses the Redis clock,
+# so every worker sees the same bucket state. Idle buckets expire once they
+# would be full again.
+# KEYS: bucket.
+# ARGV: capacity, refill rate, cost.
+# Returns {allowed, milliseconds until enough tokens are available}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = math.ceil((cost - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return {allowed, retry_after}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limiter check.
+
+    Attributes:
+        allowed: True if the request may proceed
+        retry_after: Seconds until the request would be allowed, 0 if allowed
+    """
+
+    allowed: bool
+    retry_after: int = 0
+
+
+class RateLimiter:
+    """Token bucket rate limiter, one Redis script call per check."""
+
+    def __init__(self, _aioredis: aioredis.Redis):
+        self.aioredis = _aioredis
+        self._take = self.aioredis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @staticmethod
+    def _bucket_key(name: str) -> str:
+        return f"rate_limit:{name}"
+
+    async def hit(
+        self, name: str, capacity: int, refill_rate: float, cost: int = 1
+    ) -> RateLimitResult:
+        """Take cost tokens from the bucket name.
+
+        Args:
+            name: Bucket identity, e.g. route and user ID
+            capacity: Maximum burst size
+            refill_rate: Tokens added per second
+            cost: Tokens taken by this request
+
+        Returns:
+            RateLimitResult: Whether the request is allowed, and if not, when to retry
+        """
+        allowed, retry_after_ms = await self._take(
+            keys=[self._bucket_key(name)], args=[capacity, refill_rate, cost]
+        )
+        if allowed:
+            return RateLimitResult(True)
+        return RateLimitResult(False, max(1, math.ceil(int(retry_after_ms) / 1000)))
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent loads of the same key within one worker.
+
+    The first caller for a key starts the loader in its own task; every
+    caller, including the first, awaits that task through asyncio.shield and
+    shares its result or exception. Cancelling one caller only cancels its
+    wait, never the load the other callers depend on.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run loader for key unless a load of the same key is already running.
+
+        Args:
+            key: Identity of the loaded value
+            loader: Coroutine factory producing the value
+
+        Returns:
+            Any: Result of the (possibly shared) loader call
+        """
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.create_task(loader())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return True if a load of key is currently running."""
+        return key in self._in_flight
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved so a load whose callers were all
+        # cancelled doesn't warn about it.
+        if not task.cancelled():
+            task.exception()
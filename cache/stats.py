@@ -0,0 +1,59 @@
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from metrics import redis_command_duration
+
+
+class RequestCacheStats:
+    """Redis usage of a single request.
+
+    Attributes:
+        commands: Number of Redis round trips (a pipeline or script counts once)
+        seconds: Total time spent in them
+    """
+
+    def __init__(self):
+        self.commands = 0
+        self.seconds = 0.0
+
+
+_request_cache_stats: ContextVar[Optional[RequestCacheStats]] = ContextVar(
+    "request_cache_stats", default=None
+)
+
+
+def start_request_cache_stats() -> RequestCacheStats:
+    """Begin collecting Redis usage for the current request context."""
+    stats = RequestCacheStats()
+    _request_cache_stats.set(stats)
+    return stats
+
+
+def get_request_cache_stats() -> Optional[RequestCacheStats]:
+    return _request_cache_stats.get()
+
+
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+
+def observe_redis(operation: str) -> Callable[[_F], _F]:
+    """Time a coroutine making one Redis round trip and count it against the request."""
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                redis_command_duration.labels(operation=operation).observe(elapsed)
+                if (stats := _request_cache_stats.get()) is not None:
+                    stats.commands += 1
+                    stats.seconds += elapsed
+
+        return wrapper
+
+    return decorator
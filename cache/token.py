@@ -0,0 +1,119 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from settings import settings
+
+
+class VerifiedTokenCache:
+    """Per-worker LRU of access tokens whose signature was already verified.
+
+    Maps a digest of the token to (user_id, exp), so repeated requests with
+    the same token skip the JWT decode and signature check. Entries are
+    dropped once the token expires.
+
+    The digest is an HMAC of the token keyed by the signing secret and
+    algorithm, so after a secret rotation old entries can never match again
+    and simply age out of the LRU.
+
+    The get_request_user_id dependency is a plain function that FastAPI
+    runs in its threadpool, so every access goes through a lock.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries: Maximum number of cached tokens, 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[UUID, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.verifications = 0
+        self._hit_seconds = 0.0
+        self._verify_seconds = 0.0
+
+    @staticmethod
+    def _digest(token: str, secret: str, algorithm: str) -> bytes:
+        return hmac.new(
+            secret.encode("utf-8"),
+            f"{algorithm}:{token}".encode("utf-8"),
+            hashlib.sha256,
+        ).digest()
+
+    def get(self, token: str, secret: str, algorithm: str) -> Optional[UUID]:
+        """Return the user ID of an already verified, unexpired token, or None."""
+        if self.max_entries <= 0:
+            return None
+        started = time.perf_counter()
+        digest = self._digest(token, secret, algorithm)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, exp = entry
+            if exp <= time.time():
+                del self._entries[digest]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            self._hit_seconds += time.perf_counter() - started
+        return user_id
+
+    def set(self, token: str, secret: str, algorithm: str, user_id: UUID, exp: float) -> None:
+        """Remember a verified token until its expiration time exp (unix seconds)."""
+        if self.max_entries <= 0:
+            return
+        digest = self._digest(token, secret, algorithm)
+        with self._lock:
+            self._entries[digest] = (user_id, exp)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_verification(self, seconds: float) -> None:
+        """Account the duration of a full token verification."""
+        with self._lock:
+            self.verifications += 1
+            self._verify_seconds += seconds
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit rate, counters and average auth latencies."""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "avg_hit_ms": self._hit_seconds * 1000 / self.hits if self.hits else 0.0,
+            "avg_verify_ms": (
+                self._verify_seconds * 1000 / self.verifications
+                if self.verifications
+                else 0.0
+            ),
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
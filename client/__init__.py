@@ -1,3 +1,5 @@
 from client.google_client import GoogleClient
+from client.http import create_http_client
+from client.jwks import JwksCache
 
-__all__ = ["GoogleClient"]
+__all__ = ["GoogleClient", "create_http_client", "JwksCache"]
@@ -1,18 +1,32 @@
+import asyncio
 from dataclasses import dataclass
+from typing import Optional
 import httpx
+from jose import jwt, JWTError
 
+from client.jwks import JwksCache
+from exception import GoogleAuthException
 from settings import Settings
 from schema import GoogleUserData
 
 
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+
 @dataclass
 class GoogleClient:
     settings: Settings
     async_client: httpx.AsyncClient
+    jwks: Optional[JwksCache] = None
 
     async def get_user_info(self, code: str) -> GoogleUserData:
         """Retrieves user information from Google using authorization code.
 
+        The user is read from the id_token returned by the code exchange,
+        verified locally against Google's cached signing keys. The userinfo
+        endpoint is only called if no JWKS cache is configured or Google
+        returned no id_token.
+
         Args:
             code: Authorization code received from Google OAuth2 redirect
 
@@ -20,26 +34,38 @@ class GoogleClient:
             GoogleUserData: Validated user information from Google
 
         Raises:
+            GoogleAuthException: If the id_token is invalid
             HTTPException: If API request fails or returns invalid response
             ValidationError: If user data doesn't match expected schema
         """
-        access_token = await self._get_access_token(code=code)
+        tokens = await self._get_tokens(code=code)
+        access_token = tokens["access_token"]
 
-        user_info = await self.async_client.get(
-                "https://www.googleapis.com/oauth2/v1/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"},
+        if self.jwks is not None and (id_token := tokens.get("id_token")):
+            claims = await self._verify_id_token(id_token, access_token=access_token)
+            return GoogleUserData(
+                id=claims["sub"],
+                name=claims.get("name", ""),
+                email=claims["email"],
+                verified_email=claims.get("email_verified", False),
+                access_token=access_token,
             )
 
+        user_info = await self._hedged_get(
+            self.settings.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
         return GoogleUserData(**user_info.json(), access_token=access_token)
 
-    async def _get_access_token(self, code: str) -> str:
-        """Exchanges authorization code for access token from Google OAuth2 endpoint.
+    async def _get_tokens(self, code: str) -> dict:
+        """Exchanges authorization code for tokens from Google OAuth2 endpoint.
 
         Args:
             code: Authorization code received from Google OAuth2 redirect
 
         Returns:
-            str: Access token for Google API requests
+            dict: Token response with access_token and, for the openid scope, id_token
 
         Raises:
             HTTPException: If token exchange fails or returns invalid response
@@ -53,4 +79,76 @@ class GoogleClient:
             "grant_type": "authorization_code",
         }
         response = await self.async_client.post(self.settings.GOOGLE_TOKEN_URL, data=data)
-        return response.json()["access_token"]
+        return response.json()
+
+    async def _verify_id_token(self, id_token: str, access_token: str) -> dict:
+        """Verifies Google's id_token signature and claims locally.
+
+        Args:
+            id_token: Signed JWT returned by the code exchange
+            access_token: Access token issued with it, checked against at_hash
+
+        Returns:
+            dict: Verified claims of the id_token
+
+        Raises:
+            GoogleAuthException: If the signature, audience, issuer or expiry is invalid
+        """
+        try:
+            kid = jwt.get_unverified_header(id_token).get("kid")
+        except JWTError:
+            raise GoogleAuthException
+        key = await self.jwks.get_key(kid)
+        if key is None:
+            raise GoogleAuthException
+        try:
+            return jwt.decode(
+                id_token,
+                key,
+                algorithms=["RS256"],
+                audience=self.settings.GOOGLE_CLIENT_ID,
+                issuer=GOOGLE_ISSUERS,
+                access_token=access_token,
+            )
+        except JWTError:
+            raise GoogleAuthException
+
+    async def _hedged_get(self, url: str, **kwargs) -> httpx.Response:
+        """Send an idempotent GET, hedged with a second copy if it is slow.
+
+        If GOOGLE_USERINFO_HEDGE_DELAY is set and the first request hasn't
+        finished after that many seconds, an identical request is sent and
+        whichever succeeds first wins; the other one is cancelled.
+
+        Args:
+            url: Requested URL
+            **kwargs: Passed to httpx.AsyncClient.get
+
+        Returns:
+            httpx.Response: First successful response
+
+        Raises:
+            httpx.HTTPError: If every attempt failed, the first one's error
+        """
+        hedge_delay = self.settings.GOOGLE_USERINFO_HEDGE_DELAY
+        if hedge_delay is None:
+            return await self.async_client.get(url, **kwargs)
+
+        first = asyncio.create_task(self.async_client.get(url, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done:
+            return first.result()
+
+        pending = {first, asyncio.create_task(self.async_client.get(url, **kwargs))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if not attempt.cancelled() and attempt.exception() is None:
+                        return attempt.result()
+            return first.result()
+        finally:
+            for attempt in pending:
+                attempt.cancel()
@@ -0,0 +1,41 @@
+from importlib.util import find_spec
+
+import httpx
+
+from settings import Settings
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Create the worker's pooled HTTP client for outgoing requests.
+
+    Connections are kept alive between requests, so repeated calls to the
+    same host skip the TCP and TLS handshakes. HTTP/2 is used when enabled
+    and the optional h2 package is installed. The transport retries
+    requests whose connection could not be established; requests that
+    reached the server are never retried.
+
+    Args:
+        settings: Application settings with the HTTP_* options
+
+    Returns:
+        httpx.AsyncClient: Client to share across requests, closed on shutdown
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = httpx.AsyncHTTPTransport(
+        http2=settings.HTTP2_ENABLED and find_spec("h2") is not None,
+        limits=limits,
+        retries=settings.HTTP_RETRIES,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+    )
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Optional
+
+import httpx
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from cache.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JwksCache:
+    """Signing keys (JWKS) of an OpenID provider, cached in process and in Redis.
+
+    Keys live as long as the provider's Cache-Control max-age allows. The
+    in-process copy is refreshed in the background shortly before it
+    expires, so logins don't wait for the provider. Redis shares the keys
+    between workers, so a starting worker doesn't have to fetch them itself.
+    A token signed with an unknown key ID triggers one early refetch, in
+    case the provider rotated its keys, at most every min_refetch_interval.
+
+    Attributes:
+        url: JWKS endpoint of the provider
+        default_ttl: Lifetime of the keys if the response has no max-age
+        refresh_margin: Seconds before expiry when a background refresh starts
+        min_refetch_interval: Minimum seconds between refetches for unknown key IDs
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        redis: aioredis.Redis,
+        url: str,
+        default_ttl: int = 3600,
+        refresh_margin: int = 300,
+        min_refetch_interval: int = 60,
+    ):
+        self.http_client = http_client
+        self.redis = redis
+        self.url = url
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Optional[list[dict]] = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._flight = SingleFlight()
+        self._refresh: Optional[asyncio.Task] = None
+
+    @property
+    def _redis_key(self) -> str:
+        return f"jwks:{self.url}"
+
+    async def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        """Return the signing key with the given key ID, or None if there is none."""
+        key = _find_key(await self.get_keys(), kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.min_refetch_interval:
+            key = _find_key(await self._flight.do("fetch", self._fetch), kid)
+        return key
+
+    async def get_keys(self) -> list[dict]:
+        """Return the current signing keys, loading them if they expired."""
+        now = time.monotonic()
+        if self._keys is not None and now < self._expires_at:
+            if self._expires_at - now <= self.refresh_margin:
+                self._schedule_refresh()
+            return self._keys
+        return await self._flight.do("load", self._load)
+
+    async def aclose(self) -> None:
+        """Cancel a running background refresh."""
+        if self._refresh is not None:
+            self._refresh.cancel()
+            await asyncio.gather(self._refresh, return_exceptions=True)
+
+    async def _load(self) -> list[dict]:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._redis_key)
+                pipe.pttl(self._redis_key)
+                payload, ttl_ms = await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to read cached JWKS from Redis", exc_info=True)
+            payload, ttl_ms = None, -1
+        if payload is not None and ttl_ms > 0:
+            keys = json.loads(payload)
+            self._store_local(keys, ttl_ms / 1000)
+            return keys
+        return await self._fetch()
+
+    async def _fetch(self) -> list[dict]:
+        response = await self.http_client.get(self.url)
+        response.raise_for_status()
+        keys = response.json()["keys"]
+        ttl = _max_age(response.headers.get("Cache-Control", "")) or self.default_ttl
+        self._fetched_at = time.monotonic()
+        self._store_local(keys, ttl)
+        try:
+            await self.redis.set(self._redis_key, json.dumps(keys), ex=ttl)
+        except RedisError:
+            logger.warning("Failed to cache JWKS in Redis", exc_info=True)
+        return keys
+
+    def _store_local(self, keys: list[dict], ttl: float) -> None:
+        self._keys = keys
+        self._expires_at = time.monotonic() + ttl
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh is not None and not self._refresh.done():
+            return
+        self._refresh = asyncio.create_task(self._flight.do("fetch", self._fetch))
+        self._refresh.add_done_callback(_on_refresh_done)
+
+
+def _find_key(keys: list[dict], kid: Optional[str]) -> Optional[dict]:
+    return next((key for key in keys if key.get("kid") == kid), None)
+
+
+def _max_age(cache_control: str) -> Optional[int]:
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+def _on_refresh_done(refresh: asyncio.Task) -> None:
+    if not refresh.cancelled() and (error := refresh.exception()) is not None:
+        logger.warning("Background JWKS refresh failed", exc_info=error)
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import httpx
+from fastapi import FastAPI
+from redis import asyncio as aioredis
+
+from client import JwksCache, create_http_client
+from cache import RateLimiter, get_redis_connection, get_task_codec, local_task_cache
+from repository import TaskCache
+from service.password import PasswordHasher
+from settings import Settings, settings as default_settings
+
+
+@dataclass
+class Container:
+    """Per-worker singletons shared by every request.
+
+    Built once by the lifespan hook and kept on app.state; dependencies hand
+    its members out instead of rebuilding them on every request. Overriding
+    get_container, or any dependency built on it, replaces them in tests.
+
+    Attributes:
+        settings: Application settings, read from the environment once
+        redis: Redis client bound to the worker-wide connection pool
+        task_cache: Task cache, stateless apart from its Redis client
+        http_client: Pooled HTTP client for outgoing requests
+        google_jwks: Google's id_token signing keys
+        password_hasher: Password hashing on a bounded thread pool
+        rate_limiter: Per-user, per-route token buckets in Redis
+    """
+
+    settings: Settings
+    redis: aioredis.Redis
+    task_cache: TaskCache
+    http_client: httpx.AsyncClient
+    google_jwks: JwksCache
+    password_hasher: PasswordHasher
+    rate_limiter: RateLimiter
+
+    async def aclose(self) -> None:
+        """Release the resources owned by the container."""
+        await self.google_jwks.aclose()
+        await self.http_client.aclose()
+        self.password_hasher.shutdown()
+
+
+def build_container(settings: Settings = default_settings) -> Container:
+    """Create the worker's singletons from settings."""
+    redis = get_redis_connection()
+    task_cache = TaskCache(
+        redis,
+        codec=get_task_codec(
+            name=settings.CACHE_TASKS_CODEC,
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD,
+        ),
+        ttl=settings.CACHE_TASKS_TTL,
+        local_cache=local_task_cache if settings.LOCAL_CACHE_ENABLED else None,
+        early_refresh_beta=settings.CACHE_EARLY_REFRESH_BETA,
+        empty_ttl=settings.CACHE_EMPTY_TTL,
+        page_ttl=settings.CACHE_PAGE_TTL,
+    )
+    http_client = create_http_client(settings)
+    google_jwks = JwksCache(
+        http_client,
+        redis,
+        url=settings.GOOGLE_JWKS_URL,
+        default_ttl=settings.GOOGLE_JWKS_DEFAULT_TTL,
+        refresh_margin=settings.GOOGLE_JWKS_REFRESH_MARGIN,
+        min_refetch_interval=settings.GOOGLE_JWKS_MIN_REFETCH_INTERVAL,
+    )
+    return Container(
+        settings=settings,
+        redis=redis,
+        task_cache=task_cache,
+        http_client=http_client,
+        google_jwks=google_jwks,
+        password_hasher=PasswordHasher(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+            n=settings.PASSWORD_SCRYPT_N,
+            r=settings.PASSWORD_SCRYPT_R,
+            p=settings.PASSWORD_SCRYPT_P,
+        ),
+        rate_limiter=RateLimiter(redis),
+    )
+
+
+def get_app_container(app: FastAPI) -> Container:
+    """Return the app's container, building it if the lifespan hook didn't run."""
+    container = getattr(app.state, "container", None)
+    if container is None:
+        container = app.state.container = build_container()
+    return container
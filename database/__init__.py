@@ -1,6 +1,48 @@
-from database.accessor import get_db_session, AsyncSessionFactory
+from database.accessor import (
+    engine,
+    get_db_session,
+    AsyncSessionFactory,
+    AsyncAutocommitSessionFactory,
+    AsyncReplicaSessionFactory,
+    replica_engine,
+    has_replica,
+)
+from database.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    get_autocommit_unit_of_work,
+    get_replica_unit_of_work,
+)
+from database.routing import ReplicaRouter
+from database.slow_query import set_request_route, trace_query_origin
+from database.stats import (
+    RequestDBStats,
+    start_request_db_stats,
+    get_request_db_stats,
+    get_pool_status,
+    PoolWaitStats,
+    pool_wait_stats,
+)
 
 __all__ = [
+    "engine",
     "get_db_session",
-    "AsyncSessionFactory"
+    "AsyncSessionFactory",
+    "AsyncAutocommitSessionFactory",
+    "AsyncReplicaSessionFactory",
+    "replica_engine",
+    "has_replica",
+    "UnitOfWork",
+    "get_unit_of_work",
+    "get_autocommit_unit_of_work",
+    "get_replica_unit_of_work",
+    "ReplicaRouter",
+    "set_request_route",
+    "trace_query_origin",
+    "RequestDBStats",
+    "start_request_db_stats",
+    "get_request_db_stats",
+    "get_pool_status",
+    "PoolWaitStats",
+    "pool_wait_stats",
 ]
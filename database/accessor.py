@@ -1,17 +1,72 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 
+from database.slow_query import install_slow_query_log
+from database.stats import TimedAsyncQueuePool, track_pool_checkouts, track_statements
 from settings import Settings
 
 settings = Settings()
 
-engine = create_async_engine(
-    url=settings.db_url, future=True, echo=True, pool_pre_ping=True
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        future=True,
+        echo=settings.DB_ECHO,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=(
+            {
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+            if "asyncpg" in settings.DB_DRIVER
+            else {}
+        ),
+    )
+    track_pool_checkouts(engine)
+    track_statements(engine)
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        install_slow_query_log(
+            engine,
+            threshold=settings.SLOW_QUERY_THRESHOLD,
+            explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+            explain_file=settings.SLOW_QUERY_EXPLAIN_FILE,
+            explain_max_bytes=settings.SLOW_QUERY_EXPLAIN_MAX_BYTES,
+            explain_backup_count=settings.SLOW_QUERY_EXPLAIN_BACKUP_COUNT,
+        )
+    return engine
+
+
+engine = _create_engine(settings.db_url)
+
+# Without a configured replica, reads share the primary engine and its pool.
+replica_engine = (
+    _create_engine(settings.db_replica_url)
+    if settings.db_replica_url is not None
+    else engine
 )
+has_replica = replica_engine is not engine
 
 AsyncSessionFactory = async_sessionmaker(
     bind=engine, autoflush=True, expire_on_commit=False
 )
 
+AsyncAutocommitSessionFactory = async_sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=True,
+    expire_on_commit=False,
+)
+
+AsyncReplicaSessionFactory = async_sessionmaker(
+    bind=replica_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=True,
+    expire_on_commit=False,
+)
+
 
 async def get_db_session() -> AsyncSession:
     async with AsyncSessionFactory() as async_session:
@@ -0,0 +1,49 @@
+from typing import Optional
+from uuid import UUID
+
+from redis import asyncio as aioredis
+
+
+class ReplicaRouter:
+    """Decides whether a user's reads may go to the read replica.
+
+    After a user writes, their reads are pinned to the primary for a short
+    window so they see their own changes despite replication lag. The pin
+    is a Redis key with a TTL, so it holds across all workers.
+
+    Attributes:
+        window: Seconds reads stay on the primary after a write
+        enabled: False when no replica is configured, making every check free
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        user_id: UUID,
+        window: int,
+        enabled: bool = True,
+    ):
+        self.redis = redis
+        self.user_id = user_id
+        self.window = window
+        self.enabled = enabled
+        self._use_replica: Optional[bool] = None
+
+    @staticmethod
+    def _pin_key(user_id: UUID) -> str:
+        return f"read_primary:{user_id}"
+
+    async def use_replica(self) -> bool:
+        """Whether reads may go to the replica; checked once per request."""
+        if not self.enabled:
+            return False
+        if self._use_replica is None:
+            self._use_replica = not await self.redis.exists(self._pin_key(self.user_id))
+        return self._use_replica
+
+    async def pin_primary(self) -> None:
+        """Keep the user's reads on the primary for the next window seconds."""
+        self._use_replica = False
+        if not self.enabled:
+            return
+        await self.redis.set(self._pin_key(self.user_id), 1, ex=self.window)
@@ -0,0 +1,199 @@
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+logger = logging.getLogger("slow_query")
+
+_request_route: ContextVar[Optional[str]] = ContextVar("request_route", default=None)
+_query_origin: ContextVar[Optional[str]] = ContextVar("query_origin", default=None)
+_explaining: ContextVar[bool] = ContextVar("explaining", default=False)
+# Strong references to running EXPLAINs so they aren't garbage collected.
+_explain_tasks: set[asyncio.Task] = set()
+
+# PostgreSQL prints the bound values of a statement inline in its plan, as
+# quoted literals anywhere and as bare numbers in conditions.
+_PLAN_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLAN_NUMERIC_LITERAL = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?![\w.])")
+_PLAN_CONDITION = re.compile(
+    r"^(\s*(?:Filter|Join Filter|One-Time Filter|(?:Index|Recheck|Hash|Merge|TID) Cond): )(.*)$"
+)
+
+
+def set_request_route(route: str) -> None:
+    """Remember the route of the current request for the slow query log."""
+    _request_route.set(route)
+
+
+def trace_query_origin(cls: type) -> type:
+    """Class decorator naming the repository method that issued each statement.
+
+    Wraps every public coroutine and async generator method of cls, so the
+    slow query log can tell e.g. TaskRepository.get_user_task_rows apart
+    from other queries of the same route.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        origin = f"{cls.__name__}.{name}"
+        if inspect.isasyncgenfunction(method):
+            setattr(cls, name, _trace_async_generator(method, origin))
+        elif inspect.iscoroutinefunction(method):
+            setattr(cls, name, _trace_coroutine(method, origin))
+    return cls
+
+
+def _trace_coroutine(func, origin: str):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _query_origin.set(origin)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _query_origin.reset(token)
+
+    return wrapper
+
+
+def _trace_async_generator(func, origin: str):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        # Set per step: the consumer may resume the generator from another context.
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                token = _query_origin.set(origin)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _query_origin.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+
+    return wrapper
+
+
+def install_slow_query_log(
+    engine: AsyncEngine,
+    threshold: float,
+    explain_sample_rate: float = 0.0,
+    explain_file: str = "slow_queries.log",
+    explain_max_bytes: int = 10 * 1024 * 1024,
+    explain_backup_count: int = 5,
+) -> None:
+    """Log statements of engine running longer than threshold seconds.
+
+    Each entry carries the statement, its bound parameters with values
+    redacted, the request route and the repository method that issued it.
+    An explain_sample_rate share of slow SELECTs is re-run in the background
+    as EXPLAIN (ANALYZE, BUFFERS) on a separate connection, and the plan,
+    with the literals PostgreSQL inlines into it redacted, is appended to a
+    rotating explain_file.
+
+    Args:
+        engine: Engine whose statements are watched
+        threshold: Duration in seconds above which a statement is logged
+        explain_sample_rate: Share of slow SELECTs to explain, 0 disables it
+        explain_file: Path of the rotating file receiving the plans
+        explain_max_bytes: Size at which the plan file is rotated
+        explain_backup_count: Number of rotated plan files kept
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_started
+        if elapsed < threshold or _explaining.get():
+            return
+        route, origin = _request_route.get(), _query_origin.get()
+        logger.warning(
+            "Slow query %.1f ms route=%s origin=%s statement=%s parameters=%s",
+            elapsed * 1000,
+            route,
+            origin,
+            " ".join(statement.split()),
+            _redact(parameters),
+        )
+        if (
+            explain_sample_rate > 0
+            and not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < explain_sample_rate
+        ):
+            explain_logger = _get_explain_logger(
+                explain_file, explain_max_bytes, explain_backup_count
+            )
+            task = asyncio.get_running_loop().create_task(
+                _explain(engine, statement, parameters, route, origin, explain_logger)
+            )
+            _explain_tasks.add(task)
+            task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(
+    engine: AsyncEngine,
+    statement: str,
+    parameters: Any,
+    route: Optional[str],
+    origin: Optional[str],
+    explain_logger: logging.Logger,
+) -> None:
+    _explaining.set(True)
+    try:
+        async with engine.connect() as connection:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = "\n".join(_redact_plan_line(row[0]) for row in result)
+    except Exception:
+        logger.warning("EXPLAIN of a slow query failed", exc_info=True)
+        return
+    explain_logger.info(
+        "route=%s origin=%s\n%s\n%s\n", route, origin, " ".join(statement.split()), plan
+    )
+
+
+@lru_cache
+def _get_explain_logger(path: str, max_bytes: int, backup_count: int) -> logging.Logger:
+    explain_logger = logging.getLogger("slow_query.explain")
+    explain_logger.setLevel(logging.INFO)
+    explain_logger.propagate = False
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    explain_logger.addHandler(handler)
+    return explain_logger
+
+
+def _redact(parameters: Any) -> Any:
+    """Keep the shape and types of bound parameters, drop their values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return type(parameters).__name__
+
+
+def _redact_plan_line(line: str) -> str:
+    """Replace the values of a plan line with "?", keeping costs, rows and timings."""
+    line = _PLAN_STRING_LITERAL.sub("'?'", line)
+    if match := _PLAN_CONDITION.match(line):
+        label, condition = match.groups()
+        line = label + _PLAN_NUMERIC_LITERAL.sub("?", condition)
+    return line
@@ -0,0 +1,133 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from metrics import db_pool_wait, db_statement_duration
+
+
+class RequestDBStats:
+    """Database usage of a single request.
+
+    Attributes:
+        checkouts: Number of connections checked out of the pool
+        statements: Number of SQL statements executed
+        statement_seconds: Total execution time of the statements
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.statements = 0
+        self.statement_seconds = 0.0
+
+
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def start_request_db_stats() -> RequestDBStats:
+    """Begin collecting database usage for the current request context."""
+    stats = RequestDBStats()
+    _request_db_stats.set(stats)
+    return stats
+
+
+def get_request_db_stats() -> Optional[RequestDBStats]:
+    return _request_db_stats.get()
+
+
+class PoolWaitStats:
+    """Recent time requests of this worker waited for a pool connection.
+
+    Keeps an exponentially weighted average of the waits that decays with a
+    half_life when nothing is observed, so the estimate falls back to zero
+    once the pool recovers, even if no connection is checked out meanwhile.
+
+    Attributes:
+        half_life: Seconds after which an unrefreshed estimate halves
+        alpha: Weight of a new observation in the average
+        count: Number of observed checkouts
+        total_seconds: Total time spent waiting
+    """
+
+    def __init__(self, half_life: float = 1.0, alpha: float = 0.3):
+        self.half_life = half_life
+        self.alpha = alpha
+        self.count = 0
+        self.total_seconds = 0.0
+        self._value = 0.0
+        self._updated_at = time.monotonic()
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self._value = self.current() * (1 - self.alpha) + seconds * self.alpha
+        self._updated_at = time.monotonic()
+
+    def current(self) -> float:
+        """Return the decayed average wait in seconds."""
+        elapsed = time.monotonic() - self._updated_at
+        return self._value * 0.5 ** (elapsed / self.half_life)
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long every checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            pool_wait_stats.observe(waited)
+            db_pool_wait.observe(waited)
+
+
+def track_pool_checkouts(engine: AsyncEngine) -> None:
+    """Count pool checkouts against the request that caused them."""
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if (stats := _request_db_stats.get()) is not None:
+            stats.checkouts += 1
+
+
+def track_statements(engine: AsyncEngine) -> None:
+    """Time every SQL statement and count it against the request that ran it."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._statement_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._statement_started
+        operation = (statement.split(None, 1) or [""])[0].upper()
+        db_statement_duration.labels(operation=operation).observe(elapsed)
+        if (stats := _request_db_stats.get()) is not None:
+            stats.statements += 1
+            stats.statement_seconds += elapsed
+
+
+def get_pool_status(engine: AsyncEngine) -> dict:
+    """Return saturation gauges of the engine's connection pool in this worker."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    max_overflow = max(pool._max_overflow, 0)
+    capacity = pool.size() + max_overflow
+    return {
+        "size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "saturation": pool.checkedout() / capacity if capacity > 0 else 1.0,
+    }
@@ -0,0 +1,99 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database.accessor import (
+    AsyncSessionFactory,
+    AsyncAutocommitSessionFactory,
+    AsyncReplicaSessionFactory,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """One session and one transaction shared by all repositories of a request.
+
+    Repositories bound to a unit of work never commit themselves; the owner
+    commits once at the end of the request or rolls everything back.
+    Side effects that must only happen for committed data, such as cache
+    writes, are deferred with after_commit.
+
+    Attributes:
+        session_factory: Factory of session, for work that needs a session of
+            its own on the same database, such as a streamed response
+        session: Session shared by the repositories of the request
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionFactory):
+        self.session_factory = session_factory
+        self.session: AsyncSession = session_factory()
+        self._after_commit: list[Callable[[], Awaitable]] = []
+
+    def after_commit(self, callback: Callable[[], Awaitable]) -> None:
+        """Run callback once the transaction has been committed."""
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        """Commit the transaction and run the deferred callbacks.
+
+        Callback failures are logged and don't fail the request, since the
+        data has already been committed.
+        """
+        await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("After-commit callback failed")
+
+    async def rollback(self) -> None:
+        """Roll back the transaction and drop the deferred callbacks."""
+        self._after_commit.clear()
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+@asynccontextmanager
+async def _unit_of_work_scope(session_factory: async_sessionmaker) -> AsyncIterator[UnitOfWork]:
+    unit_of_work = UnitOfWork(session_factory)
+    try:
+        yield unit_of_work
+        await unit_of_work.commit()
+    except Exception:
+        await unit_of_work.rollback()
+        raise
+    finally:
+        await unit_of_work.close()
+
+
+async def get_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """Request-scoped unit of work committed when the handler succeeds."""
+    async with _unit_of_work_scope(AsyncSessionFactory) as unit_of_work:
+        yield unit_of_work
+
+
+async def get_autocommit_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """Request-scoped unit of work for read-only paths.
+
+    The session runs in AUTOCOMMIT isolation, so reads don't open a
+    transaction and return their connection to the pool right away.
+    """
+    async with _unit_of_work_scope(AsyncAutocommitSessionFactory) as unit_of_work:
+        yield unit_of_work
+
+
+async def get_replica_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """Request-scoped unit of work for reads that may run on the replica.
+
+    Falls back to the primary in AUTOCOMMIT mode when no replica is
+    configured. Override this dependency to point tests at another database.
+    """
+    async with _unit_of_work_scope(AsyncReplicaSessionFactory) as unit_of_work:
+        yield unit_of_work
@@ -1,74 +1,74 @@
+import logging
+from typing import Awaitable, Callable
+
 import httpx
+from redis.exceptions import RedisError
 
-from fastapi import HTTPException, status, Depends, Security
+from fastapi import HTTPException, Request, status, Depends, Security
 from fastapi.security import HTTPBearer, http
 from uuid import UUID
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from client import GoogleClient
-from exception import TokenExpiredException, InvalidTokenException
+from container import Container, get_app_container
+from exception import TokenExpiredException, InvalidTokenException, RateLimitExceededException
 from repository import TaskRepository, TaskCache, UserRepository
-from cache import get_redis_connection
 from service import TaskService, UserService, AuthService
 from settings import Settings
-from database import get_db_session
+from database import (
+    UnitOfWork,
+    ReplicaRouter,
+    get_unit_of_work,
+    get_autocommit_unit_of_work,
+    get_replica_unit_of_work,
+    has_replica,
+)
 
 
-def get_tasks_repository() -> TaskRepository:
-    """
-    Retrieves an instance of the task repository.
-    Returns:
-        TaskRepository: An instance of the task repository.
-    """
-    return TaskRepository()
+logger = logging.getLogger(__name__)
 
 
-def get_cache_tasks_repository() -> TaskCache:
+def get_container(request: Request) -> Container:
     """
-    Retrieves an instance of the task cache using a Redis connection.
+    Retrieves the per-worker container of singletons built at startup.
     Returns:
-        TaskCache: An instance of the task cache.
+        Container: The application's container.
     """
-    redis_connection = get_redis_connection()
-    return TaskCache(redis_connection)
+    return get_app_container(request.app)
 
 
-def get_task_service(
-    task_repository: TaskRepository = Depends(get_tasks_repository),
-    task_cache: TaskCache = Depends(get_cache_tasks_repository),
-) -> TaskService:
+def get_settings(container: Container = Depends(get_container)) -> Settings:
     """
-    Retrieves an instance of the task service.
-    Args:
-        task_repository (TaskRepository, optional): The task repository. Defaults to the result of
-            the get_tasks_repository function.
-        task_cache (TaskCache, optional): The task cache. Defaults to the result of
-            the get_cache_tasks_repository function.
+    Retrieves the application settings loaded once at startup.
     Returns:
-        TaskService: An instance of the task service.
+        Settings: The application settings.
     """
-    return TaskService(
-        task_repository=task_repository,
-        task_cache=task_cache,
-    )
+    return container.settings
 
 
-def get_user_repository() -> UserRepository:
+def get_user_repository(unit_of_work: UnitOfWork = Depends(get_unit_of_work)) -> UserRepository:
     """
-    Retrieves an instance of the user repository.
+    Retrieves an instance of the user repository bound to the request's unit of work.
+    Lookups stay on the primary: a user who just signed up or changed their
+    password must be able to log in before the replica catches up.
     Returns:
         UserRepository: An instance of the user repository.
     """
-    return UserRepository()
+    return UserRepository(unit_of_work=unit_of_work)
 
 
-async def get_async_client() -> httpx.AsyncClient:
-    async with httpx.AsyncClient() as client:
-        yield client
+def get_async_client(container: Container = Depends(get_container)) -> httpx.AsyncClient:
+    """
+    Retrieves the worker's pooled HTTP client, shared by all requests.
+    Returns:
+        httpx.AsyncClient: The shared HTTP client.
+    """
+    return container.http_client
 
 
 def get_google_client(
     async_client: httpx.AsyncClient = Depends(get_async_client),
+    settings: Settings = Depends(get_settings),
+    container: Container = Depends(get_container),
 ) -> GoogleClient:
     """
     Retrieves an instance of the Google client configured with application settings.
@@ -77,12 +77,18 @@ def get_google_client(
         GoogleClient: An instance of Google client for OAuth authentication and
         user information retrieval from Google APIs.
     """
-    return GoogleClient(settings=Settings(), async_client=async_client)
+    return GoogleClient(
+        settings=settings,
+        async_client=async_client,
+        jwks=container.google_jwks,
+    )
 
 
 def get_auth_service(
     user_repository: UserRepository = Depends(get_user_repository),
     google_client: GoogleClient = Depends(get_google_client),
+    settings: Settings = Depends(get_settings),
+    container: Container = Depends(get_container),
 ) -> AuthService:
     """
     Retrieves an instance of the authentication service.
@@ -96,8 +102,9 @@ def get_auth_service(
     """
     return AuthService(
         user_repository=user_repository,
-        settings=Settings(),
+        settings=settings,
         google_client=google_client,
+        password_hasher=container.password_hasher,
     )
 
 
@@ -149,3 +156,151 @@ def get_request_user_id(
             detail=e.detail,
         )
     return user_id
+
+
+def rate_limit(route: str, read: bool = False) -> Callable[..., Awaitable[None]]:
+    """
+    Builds a dependency limiting how often a user may call a route.
+    Every (route, user) pair gets its own token bucket in Redis, sized by the
+    RATE_LIMIT_READ_* or RATE_LIMIT_WRITE_* settings. If Redis is unavailable
+    the request is let through.
+    Args:
+        route (str): Name of the route's bucket.
+        read (bool, optional): Use the read limits instead of the write limits.
+    Returns:
+        Callable: Dependency raising 429 with Retry-After once the bucket is empty.
+    """
+
+    async def check_rate_limit(
+        user_id: UUID = Depends(get_request_user_id),
+        settings: Settings = Depends(get_settings),
+        container: Container = Depends(get_container),
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if read:
+            capacity = settings.RATE_LIMIT_READ_CAPACITY
+            refill_rate = settings.RATE_LIMIT_READ_REFILL
+        else:
+            capacity = settings.RATE_LIMIT_WRITE_CAPACITY
+            refill_rate = settings.RATE_LIMIT_WRITE_REFILL
+        try:
+            result = await container.rate_limiter.hit(
+                f"{route}:{user_id}", capacity=capacity, refill_rate=refill_rate
+            )
+        except RedisError:
+            logger.warning("Rate limiter unavailable, letting request through", exc_info=True)
+            return
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=RateLimitExceededException.detail,
+                headers={"Retry-After": str(result.retry_after)},
+            )
+
+    return check_rate_limit
+
+
+def get_replica_router(
+    user_id: UUID = Depends(get_request_user_id),
+    settings: Settings = Depends(get_settings),
+    container: Container = Depends(get_container),
+) -> ReplicaRouter:
+    """
+    Retrieves the read replica router of the requesting user.
+    Args:
+        user_id (UUID, optional): The user ID. Defaults to the result of
+            the get_request_user_id function.
+    Returns:
+        ReplicaRouter: Router keeping the user's reads on the primary after their writes.
+    """
+    return ReplicaRouter(
+        container.redis,
+        user_id=user_id,
+        window=settings.DB_READ_YOUR_WRITES_WINDOW,
+        enabled=has_replica,
+    )
+
+
+def get_tasks_repository(
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+) -> TaskRepository:
+    """
+    Retrieves an instance of the task repository bound to the request's unit of work.
+    Returns:
+        TaskRepository: An instance of the task repository.
+    """
+    return TaskRepository(unit_of_work=unit_of_work)
+
+
+def get_readonly_tasks_repository(
+    unit_of_work: UnitOfWork = Depends(get_autocommit_unit_of_work),
+    read_unit_of_work: UnitOfWork = Depends(get_replica_unit_of_work),
+    replica_router: ReplicaRouter = Depends(get_replica_router),
+) -> TaskRepository:
+    """
+    Retrieves an instance of the task repository for read-only paths, running
+    its queries on the read replica, or on the primary in autocommit mode
+    while the user is pinned there after a write.
+    Returns:
+        TaskRepository: An instance of the task repository.
+    """
+    return TaskRepository(
+        unit_of_work=unit_of_work,
+        read_unit_of_work=read_unit_of_work,
+        replica_router=replica_router,
+    )
+
+
+def get_cache_tasks_repository(container: Container = Depends(get_container)) -> TaskCache:
+    """
+    Retrieves the worker's task cache backed by the worker-wide Redis pool.
+    Returns:
+        TaskCache: The task cache.
+    """
+    return container.task_cache
+
+
+def get_task_service(
+    task_repository: TaskRepository = Depends(get_tasks_repository),
+    task_cache: TaskCache = Depends(get_cache_tasks_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    replica_router: ReplicaRouter = Depends(get_replica_router),
+) -> TaskService:
+    """
+    Retrieves an instance of the task service.
+    Args:
+        task_repository (TaskRepository, optional): The task repository. Defaults to the result of
+            the get_tasks_repository function.
+        task_cache (TaskCache, optional): The task cache. Defaults to the result of
+            the get_cache_tasks_repository function.
+        unit_of_work (UnitOfWork, optional): The request's unit of work. Defaults to the result of
+            the get_unit_of_work function.
+        replica_router (ReplicaRouter, optional): Pins the user's reads to the primary after
+            writes. Defaults to the result of the get_replica_router function.
+    Returns:
+        TaskService: An instance of the task service.
+    """
+    return TaskService(
+        task_repository=task_repository,
+        task_cache=task_cache,
+        unit_of_work=unit_of_work,
+        replica_router=replica_router,
+    )
+
+
+def get_readonly_task_service(
+    task_repository: TaskRepository = Depends(get_readonly_tasks_repository),
+    task_cache: TaskCache = Depends(get_cache_tasks_repository),
+) -> TaskService:
+    """
+    Retrieves an instance of the task service for read-only endpoints.
+    Args:
+        task_repository (TaskRepository, optional): The task repository. Defaults to the result of
+            the get_readonly_tasks_repository function.
+        task_cache (TaskCache, optional): The task cache. Defaults to the result of
+            the get_cache_tasks_repository function.
+    Returns:
+        TaskService: An instance of the task service.
+    """
+    return TaskService(task_repository=task_repository, task_cache=task_cache)
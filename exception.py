@@ -16,3 +16,23 @@ class InvalidTokenException(Exception):
 
 class TaskNotFoundException(Exception):
     detail = "Task not found"
+
+
+class InvalidCursorException(Exception):
+    detail = "Invalid pagination cursor"
+
+
+class GoogleAuthException(Exception):
+    detail = "Google authentication failed"
+
+
+class PasswordHasherBusyException(Exception):
+    detail = "Too many logins in progress, retry later"
+
+
+class RateLimitExceededException(Exception):
+    detail = "Too many requests"
+
+
+class ServiceOverloadedException(Exception):
+    detail = "Service overloaded, retry later"
@@ -1,8 +1,10 @@
 from gcorn.application import GunicornApplication
 from gcorn.app_options import get_app_options
+from gcorn.prometheus import prepare_multiprocess_dir
 
 
 __all__ = [
     "GunicornApplication",
     "get_app_options",
+    "prepare_multiprocess_dir",
 ]
@@ -1,4 +1,5 @@
 from gcorn.logger import GunicornLogger
+from gcorn.prometheus import child_exit
 
 
 def get_app_options(
@@ -18,4 +19,5 @@ def get_app_options(
         "timeout": timeout,
         "access_log": "-",
         "error_log": "-",
+        "child_exit": child_exit,
     }
@@ -0,0 +1,29 @@
+import os
+import shutil
+from pathlib import Path
+
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiprocess_dir(path: str) -> None:
+    """Point prometheus_client at an empty directory for per-worker metric files.
+
+    Must run in the gunicorn master before the application, and with it
+    prometheus_client, is imported: every worker then writes its samples
+    to files that /metrics of any worker aggregates. Files of a previous
+    run are removed so their samples don't leak into this one.
+    """
+    directory = Path(path)
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+    os.environ[MULTIPROC_DIR_ENV] = str(directory)
+
+
+def child_exit(server, worker) -> None:
+    """Gunicorn hook dropping the live gauges of an exited worker."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,8 +1,11 @@
-from gcorn import GunicornApplication, get_app_options
-from main import app
+from gcorn import GunicornApplication, get_app_options, prepare_multiprocess_dir
 from settings import settings
 
 def main():
+    prepare_multiprocess_dir(settings.PROMETHEUS_MULTIPROC_DIR)
+    # Imported only now, so prometheus_client sees the multiprocess directory.
+    from main import app
+
     GunicornApplication(
         application=app,
         options=get_app_options(
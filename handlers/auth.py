@@ -5,7 +5,12 @@ from fastapi.responses import RedirectResponse
 from schema import UserLoginSchema, UserCreateSchema
 from service import AuthService
 from dependency import get_auth_service
-from exception import UserNotFoundException, UserUnCorrectPasswordException
+from exception import (
+    UserNotFoundException,
+    UserUnCorrectPasswordException,
+    GoogleAuthException,
+    PasswordHasherBusyException,
+)
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -17,11 +22,13 @@ async def login(
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ):
     try:
-        return auth_service.login(body.username, body.password)
+        return await auth_service.login(body.username, body.password)
     except UserNotFoundException as e:
         raise HTTPException(status_code=404, detail=e.detail)
     except UserUnCorrectPasswordException as e:
         raise HTTPException(status_code=401, detail=e.detail)
+    except PasswordHasherBusyException as e:
+        raise HTTPException(status_code=503, detail=e.detail, headers={"Retry-After": "1"})
 
 
 @router.get("/app")
@@ -44,5 +51,8 @@ async def google_callback(
         code: str
 ):
     """Handle Google OAuth callback """
-    return await auth_service.google_auth(code=code)
+    try:
+        return await auth_service.google_auth(code=code)
+    except GoogleAuthException as e:
+        raise HTTPException(status_code=401, detail=e.detail)
 
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+
+from metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose Prometheus metrics aggregated over all workers."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,15 +1,34 @@
 from fastapi import APIRouter
-from settings import Settings
+from sqlalchemy import text
+from cache import local_task_cache, verified_token_cache
+from database import engine, get_pool_status
+from load_shedding import load_shedder
+from repository import task_cache_stats
 
 router = APIRouter(prefix="/ping", tags=["ping_app, ping_db"])
 
 
 @router.get("/db")
 async def ping_db():
-    settings = Settings()
-    return {"message": settings.GOOGLE_TOKEN_ID}
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return {"message": "db is working"}
 
 
 @router.get("/app")
 async def ping_app():
     return {"message": "app is working"}
+
+
+@router.get("/cache")
+async def ping_cache():
+    return {
+        "local_task_cache": local_task_cache.stats(),
+        "task_cache": task_cache_stats.as_dict(),
+        "verified_token_cache": verified_token_cache.stats(),
+    }
+
+
+@router.get("/pool")
+async def ping_pool():
+    return {"db_pool": get_pool_status(engine), "load_shedding": load_shedder.stats()}
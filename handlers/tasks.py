@@ -1,24 +1,85 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from exception import TaskNotFoundException
-from schema import TaskCreate, TaskResponse, TaskUpdate
-from dependency import get_task_service, get_request_user_id
+from exception import TaskNotFoundException, InvalidCursorException
+from schema import (
+    TaskCreate,
+    TaskResponse,
+    TaskUpdate,
+    TaskQuery,
+    TaskPage,
+    TaskBulkRequest,
+    TaskBulkResponse,
+)
+from dependency import (
+    get_task_service,
+    get_readonly_task_service,
+    get_request_user_id,
+    rate_limit,
+)
 from service import TaskService
 
 router = APIRouter(prefix="/task", tags=["task"])
 
 
-@router.get("/all", response_model=list[TaskResponse])
+@router.get(
+    "/all",
+    response_model=list[TaskResponse] | TaskPage,
+    dependencies=[Depends(rate_limit("task:list", read=True))],
+)
 async def get_tasks(
-    task_service: Annotated[TaskService, Depends(get_task_service)],
+    request: Request,
+    task_service: Annotated[TaskService, Depends(get_readonly_task_service)],
+    query: Annotated[TaskQuery, Query()],
+    user_id: UUID = Depends(get_request_user_id),
+):
+    """Return all user's tasks, or a single page if any query parameter is given.
+
+    The full list is sent as the JSON array prepared by the cache, bypassing
+    response_model serialization. Pagination is detected from the raw query
+    string: FastAPI fills TaskQuery defaults in, so its model_fields_set is
+    never empty.
+    """
+    if not TaskQuery.model_fields.keys() & request.query_params.keys():
+        return Response(
+            await task_service.get_user_tasks_json(user_id),
+            media_type="application/json",
+        )
+    try:
+        return await task_service.get_user_tasks_page(user_id, query)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.detail)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(rate_limit("task:export", read=True))],
+)
+async def export_tasks(
+    task_service: Annotated[TaskService, Depends(get_readonly_task_service)],
+    export_format: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson",
     user_id: UUID = Depends(get_request_user_id),
 ):
-    return await task_service.get_user_tasks(user_id)
+    """Stream all user's tasks as NDJSON or CSV."""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        task_service.export_user_tasks(user_id, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED, response_model=TaskResponse)
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=TaskResponse,
+    dependencies=[Depends(rate_limit("task:create"))],
+)
 async def create_task(
     task: TaskCreate,
     task_service: Annotated[TaskService, Depends(get_task_service)],
@@ -27,7 +88,25 @@ async def create_task(
     return await task_service.create_task(task, user_id)
 
 
-@router.patch("/{task_id}", response_model=TaskResponse)
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    dependencies=[Depends(rate_limit("task:bulk"))],
+)
+async def bulk_write_tasks(
+    bulk: TaskBulkRequest,
+    task_service: Annotated[TaskService, Depends(get_task_service)],
+    user_id: UUID = Depends(get_request_user_id),
+):
+    """Create, update and delete many tasks in one transaction."""
+    return await task_service.bulk_write(bulk, user_id)
+
+
+@router.patch(
+    "/{task_id}",
+    response_model=TaskResponse,
+    dependencies=[Depends(rate_limit("task:update"))],
+)
 async def update_task(
     task: TaskUpdate,
     task_service: Annotated[TaskService, Depends(get_task_service)],
@@ -39,7 +118,11 @@ async def update_task(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.detail)
 
 
-@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("task:delete"))],
+)
 async def delete_task(
     task_id: UUID,
     task_service: Annotated[TaskService, Depends(get_task_service)],
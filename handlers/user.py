@@ -1,7 +1,8 @@
 from typing import Annotated
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, HTTPException
 
 from dependency import get_user_service
+from exception import PasswordHasherBusyException
 from schema import UserLoginSchema, UserCreateSchema
 from service import UserService
 
@@ -13,4 +14,7 @@ async def create_user(
         user: UserCreateSchema,
         user_service: Annotated[UserService, Depends(get_user_service)]
 ) -> UserLoginSchema:
-    return await user_service.create_user(user)
+    try:
+        return await user_service.create_user(user)
+    except PasswordHasherBusyException as e:
+        raise HTTPException(status_code=503, detail=e.detail, headers={"Retry-After": "1"})
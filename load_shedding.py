@@ -0,0 +1,90 @@
+import asyncio
+import time
+from typing import Optional
+
+from database import PoolWaitStats, pool_wait_stats
+from metrics import event_loop_lag
+from settings import settings
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a timer.
+
+    A task sleeps for interval seconds in a loop; the time it oversleeps is
+    the lag every other coroutine of the worker currently suffers.
+
+    Attributes:
+        interval: Seconds between measurements
+        lag: Last measured lag in seconds
+        max_lag: Highest lag measured so far
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+
+    async def run(self) -> None:
+        """Measure forever; run it as a background task."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.max_lag = max(self.max_lag, self.lag)
+            event_loop_lag.set(self.lag)
+
+
+loop_lag_monitor = LoopLagMonitor(interval=settings.LOOP_LAG_INTERVAL)
+
+
+class LoadShedder:
+    """Decides when a worker is too overloaded to accept more requests.
+
+    Rejecting requests early, while they are still cheap, keeps the latency
+    of the admitted ones flat instead of letting every request queue up for
+    a database connection or for the event loop.
+
+    Attributes:
+        pool_wait_threshold: Recent average pool wait in seconds above which requests are shed
+        loop_lag_threshold: Event loop lag in seconds above which requests are shed
+        retry_after: Seconds clients are asked to wait before retrying
+        shed: Number of rejected requests
+    """
+
+    def __init__(
+        self,
+        pool_wait_threshold: float,
+        loop_lag_threshold: float,
+        retry_after: int = 1,
+        pool_wait: PoolWaitStats = pool_wait_stats,
+        loop_lag: LoopLagMonitor = loop_lag_monitor,
+    ):
+        self.pool_wait_threshold = pool_wait_threshold
+        self.loop_lag_threshold = loop_lag_threshold
+        self.retry_after = retry_after
+        self.pool_wait = pool_wait
+        self.loop_lag = loop_lag
+        self.shed = 0
+
+    def overload_reason(self) -> Optional[str]:
+        """Return why the worker is overloaded, or None if it can take requests."""
+        if self.pool_wait.current() > self.pool_wait_threshold:
+            return "db_pool_wait"
+        if self.loop_lag.lag > self.loop_lag_threshold:
+            return "event_loop_lag"
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "shed": self.shed,
+            "pool_wait": self.pool_wait.current(),
+            "loop_lag": self.loop_lag.lag,
+            "max_loop_lag": self.loop_lag.max_lag,
+        }
+
+
+load_shedder = LoadShedder(
+    pool_wait_threshold=settings.LOAD_SHED_POOL_WAIT,
+    loop_lag_threshold=settings.LOAD_SHED_LOOP_LAG,
+    retry_after=settings.LOAD_SHED_RETRY_AFTER,
+)
@@ -1,8 +1,100 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from cache import (
+    start_request_cache_stats,
+    init_redis_pool,
+    close_redis_pool,
+    get_pubsub_connection,
+    listen_for_invalidations,
+    local_task_cache,
+)
+from container import build_container
+from database import start_request_db_stats, set_request_route
+from exception import ServiceOverloadedException
 from handlers import routers
+from load_shedding import load_shedder, loop_lag_monitor
+from metrics import (
+    http_request_duration,
+    db_statements_per_request,
+    redis_commands_per_request,
+    load_shed_requests,
+)
+from settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create per-worker shared resources on startup and release them on shutdown."""
+    init_redis_pool()
+    app.state.container = container = build_container(settings)
+    invalidation_listener = pubsub_redis = None
+    if settings.LOCAL_CACHE_ENABLED:
+        pubsub_redis = get_pubsub_connection()
+        invalidation_listener = asyncio.create_task(
+            listen_for_invalidations(pubsub_redis, local_task_cache)
+        )
+    lag_monitor = asyncio.create_task(loop_lag_monitor.run())
+    yield
+    lag_monitor.cancel()
+    with suppress(asyncio.CancelledError):
+        await lag_monitor
+    if invalidation_listener:
+        invalidation_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await invalidation_listener
+        await pubsub_redis.aclose()
+    await container.aclose()
+    await close_redis_pool()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def request_stats_middleware(request: Request, call_next):
+    """Record latency, SQL and Redis usage of the request.
+
+    Also reports how many pool connections the request checked out.
+    """
+    set_request_route(f"{request.method} {request.url.path}")
+    db_stats = start_request_db_stats()
+    cache_stats = start_request_cache_stats()
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    route = route.path if route is not None else "unmatched"
+    http_request_duration.labels(
+        method=request.method, route=route, status=response.status_code
+    ).observe(time.perf_counter() - started)
+    db_statements_per_request.labels(route=route).observe(db_stats.statements)
+    redis_commands_per_request.labels(route=route).observe(cache_stats.commands)
+    response.headers["X-DB-Checkouts"] = str(db_stats.checkouts)
+    return response
+
 
+@app.middleware("http")
+async def load_shedding_middleware(request: Request, call_next):
+    """Reject requests with 503 while the worker is overloaded.
 
-app = FastAPI()
+    Health checks under /ping and /metrics are always served.
+    """
+    if settings.LOAD_SHEDDING_ENABLED and not request.url.path.startswith(
+        ("/ping", "/metrics")
+    ):
+        if (reason := load_shedder.overload_reason()) is not None:
+            load_shedder.shed += 1
+            load_shed_requests.labels(reason=reason).inc()
+            return JSONResponse(
+                status_code=503,
+                content={"detail": ServiceOverloadedException.detail},
+                headers={"Retry-After": str(load_shedder.retry_after)},
+            )
+    return await call_next(request)
 
 
 for router in routers:
@@ -0,0 +1,26 @@
+from metrics.collectors import (
+    http_request_duration,
+    db_statement_duration,
+    db_statements_per_request,
+    db_pool_wait,
+    redis_command_duration,
+    redis_commands_per_request,
+    task_cache_lookups,
+    event_loop_lag,
+    load_shed_requests,
+)
+from metrics.exposition import render_metrics
+
+
+__all__ = [
+    "http_request_duration",
+    "db_statement_duration",
+    "db_statements_per_request",
+    "db_pool_wait",
+    "redis_command_duration",
+    "redis_commands_per_request",
+    "task_cache_lookups",
+    "event_loop_lag",
+    "load_shed_requests",
+    "render_metrics",
+]
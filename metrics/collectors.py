@@ -0,0 +1,66 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+
+_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds",
+    "Duration of SQL statements",
+    ["operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+db_statements_per_request = Histogram(
+    "db_statements_per_request",
+    "Number of SQL statements executed by one HTTP request",
+    ["route"],
+    buckets=_COUNT_BUCKETS,
+)
+
+db_pool_wait = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    buckets=_LATENCY_BUCKETS,
+)
+
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Latency of Redis round trips made by the task cache",
+    ["operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+redis_commands_per_request = Histogram(
+    "redis_commands_per_request",
+    "Number of Redis round trips made by one HTTP request",
+    ["route"],
+    buckets=_COUNT_BUCKETS,
+)
+
+task_cache_lookups = Counter(
+    "task_cache_lookups_total",
+    "Task list cache lookups by tier and result",
+    ["tier", "result"],
+)
+
+event_loop_lag = Gauge(
+    "event_loop_lag_seconds",
+    "Last measured event loop lag of a worker",
+    multiprocess_mode="livemax",
+)
+
+load_shed_requests = Counter(
+    "load_shed_requests_total",
+    "Requests rejected by load shedding",
+    ["reason"],
+)
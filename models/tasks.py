@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Integer
+from sqlalchemy import String, ForeignKey, Integer, Index
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from typing import Optional
@@ -21,6 +21,16 @@ class Category(Base):
 
 class Task(Base):
     __tablename__ = "Tasks"
+    __table_args__ = (
+        Index("ix_Tasks_user_id_task_id", "user_id", "task_id"),
+        Index("ix_Tasks_user_id_name_task_id", "user_id", "name", "task_id"),
+        Index(
+            "ix_Tasks_user_id_pomodoro_count_task_id",
+            "user_id",
+            "pomodoro_count",
+            "task_id",
+        ),
+    )
 
     task_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
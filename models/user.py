@@ -16,7 +16,7 @@ class UserProfile(Base):
     )
     username: Mapped[str] = mapped_column(String(255), nullable=True, unique=True)
     password: Mapped[str] = mapped_column(String(255), nullable=True)
-    google_access_token: Mapped[Optional[str]]
+    google_access_token: Mapped[Optional[str]] = mapped_column(index=True)
     yandex_access_token: Mapped[Optional[str]]
-    email: Mapped[Optional[str]]
+    email: Mapped[Optional[str]] = mapped_column(index=True)
     name: Mapped[Optional[str]]
@@ -1,5 +1,5 @@
 from repository.task import TaskRepository
-from repository.cache_tasks import TaskCache
+from repository.cache_tasks import TaskCache, task_cache_stats
 from repository.user import UserRepository
 
-__all__ = ["TaskRepository", "TaskCache", "UserRepository"]
+__all__ = ["TaskRepository", "TaskCache", "UserRepository", "task_cache_stats"]
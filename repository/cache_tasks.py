@@ -1,84 +1,556 @@
-import json
+import asyncio
+import math
+import random
+import secrets
+import time
+from typing import NamedTuple, Optional, Sequence
 from uuid import UUID
+from pydantic import TypeAdapter
 from redis import asyncio as aioredis
+from redis.exceptions import WatchError
 
+from cache.codec import TaskCodec, JsonTaskCodec
+from cache.invalidation import INVALIDATION_CHANNEL
+from cache.local import LocalTaskCache
+from cache.stats import observe_redis
+from metrics import task_cache_lookups
 from schema import TaskResponse
+from settings import settings
+
+
+# Applies a batch of task writes to an already cached hash in one call.
+# Upserted tasks keep their position, new ones are appended to the ordering
+# index; removed tasks leave both. A cached "no tasks" marker (KEYS[3]) is
+# patched like an empty hash, and takes the hash's place when its last task
+# goes away. If nothing is cached the write is skipped, so a partial hash is
+# never mistaken for the user's full task list. Refreshes TTLs, drops cached
+# pages, bumps the user's version so in-flight rebuilds don't store an older
+# list, and announces the change to every worker.
+# KEYS: hash, order, empty marker, meta, pages, version.
+# ARGV: ttl, empty ttl, invalidation channel, user_id, upsert count N,
+#       N pairs of (task_id, payload), then the removed task_ids.
+PATCH_TASKS_SCRIPT = """
+redis.call('PUBLISH', ARGV[3], ARGV[4])
+redis.call('DEL', KEYS[5])
+redis.call('INCR', KEYS[6])
+redis.call('EXPIRE', KEYS[6], ARGV[1])
+if redis.call('EXISTS', KEYS[1]) == 0 and redis.call('EXISTS', KEYS[3]) == 0 then
+    return 0
+end
+local upserts_end = 5 + 2 * tonumber(ARGV[5])
+if upserts_end > 5 then
+    local last = redis.call('ZREVRANGE', KEYS[2], 0, 0, 'WITHSCORES')
+    local score = 0
+    if #last > 0 then
+        score = tonumber(last[2]) + 1
+    end
+    for i = 6, upserts_end, 2 do
+        if redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+            redis.call('ZADD', KEYS[2], score, ARGV[i])
+            score = score + 1
+        end
+    end
+end
+for i = upserts_end + 1, #ARGV do
+    if redis.call('HDEL', KEYS[1], ARGV[i]) == 1 then
+        redis.call('ZREM', KEYS[2], ARGV[i])
+    end
+end
+if redis.call('HLEN', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[2], KEYS[4])
+    redis.call('SET', KEYS[3], 1, 'EX', ARGV[2])
+else
+    redis.call('DEL', KEYS[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+    redis.call('EXPIRE', KEYS[4], ARGV[1])
+end
+return 1
+"""
+
+# Deletes the rebuild lock only if it is still held by the caller's token.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+EMPTY_TASKS_JSON = b"[]"
+
+_task_list_adapter = TypeAdapter(list[TaskResponse])
+
+
+class TaskCacheLookup(NamedTuple):
+    """Result of a cache read.
+
+    Attributes:
+        tasks: Cached tasks, None on miss, empty if the user has no tasks
+        refresh_due: True if the entry should be recomputed ahead of expiry
+    """
+
+    tasks: Optional[list[TaskResponse]]
+    refresh_due: bool = False
+
+
+class TaskCacheJsonLookup(NamedTuple):
+    """Result of a cache read that keeps the tasks serialized.
+
+    Attributes:
+        payload: JSON array of the cached tasks, None on miss
+        refresh_due: True if the entry should be recomputed ahead of expiry
+    """
+
+    payload: Optional[bytes]
+    refresh_due: bool = False
+
+
+class TaskCacheStats:
+    """Per-worker counters of negative caching.
+
+    Attributes:
+        negative_hits: Reads answered by the "no tasks" marker, i.e. DB reads avoided
+        negative_stores: Times the "no tasks" marker was written
+    """
+
+    def __init__(self):
+        self.negative_hits = 0
+        self.negative_stores = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "negative_hits": self.negative_hits,
+            "negative_stores": self.negative_stores,
+        }
+
+
+task_cache_stats = TaskCacheStats()
 
 
 class TaskCache:
     """Redis-based cache for storing and retrieving task data.
 
-    Provides methods for caching task lists and individual tasks with JSON serialization.
+    A user's tasks are stored as a Redis hash keyed by task_id, with a sorted
+    set keeping their order, so creating, updating and deleting a task patch
+    the cache in O(1) instead of dropping it. Values are serialized by a
+    pluggable codec. Every write is sent as a single MULTI/EXEC transaction
+    or Lua script, so readers never observe a half-written list.
+
+    Filtered and paginated reads are cached separately as whole pages in a
+    per-user hash keyed by a digest of the query; any write to the user's
+    tasks drops all of them.
+
+    Users without tasks are cached as a separate "no tasks" marker with its
+    own, shorter TTL, so they don't hit the database on every request.
+
+    Every task is stored as the JSON document of its TaskResponse, validated
+    once when it is written, so hits can be answered with the stored bytes
+    joined into a JSON array without parsing them.
+
+    An optional in-process tier is consulted before Redis. Writes that change
+    a user's tasks publish the user ID on the invalidation channel so every
+    worker drops its local copy.
+
+    Rebuilds after a miss are serialized across workers with a short lock,
+    and reads may report an entry as due for probabilistic early refresh
+    (XFetch) based on how long its last rebuild took and its remaining TTL.
+
+    Every write bumps a per-user version. A rebuild reads it before querying
+    the database and stores its list or page only if no write happened
+    since, so a slow or lagging read can't overwrite the cache with older
+    data.
 
     Attributes:
-        aioredis: Redis client instance
+        aioredis: Redis client bound to the worker-wide connection pool
+        codec: Serialization format of cached tasks
+        ttl: Expiration of a cached task list in seconds
+        local_cache: Per-worker in-process tier, disabled if None
+        early_refresh_beta: XFetch aggressiveness, 0 disables early refresh
+        empty_ttl: Expiration of the "no tasks" marker in seconds
+        page_ttl: Expiration of cached pages in seconds
     """
 
-    def __init__(self, _aioredis: aioredis.Redis):
+    def __init__(
+        self,
+        _aioredis: aioredis.Redis,
+        codec: TaskCodec | None = None,
+        ttl: int = settings.CACHE_TASKS_TTL,
+        local_cache: LocalTaskCache | None = None,
+        early_refresh_beta: float = settings.CACHE_EARLY_REFRESH_BETA,
+        empty_ttl: int = settings.CACHE_EMPTY_TTL,
+        page_ttl: int = settings.CACHE_PAGE_TTL,
+    ):
         """Initialize TaskCache with Redis connection.
 
         Args:
             _aioredis: Configured Redis client instance
+            codec: Serialization format, plain JSON by default
+            ttl: Expiration of a cached task list in seconds
+            local_cache: Per-worker in-process tier, disabled if None
+            early_refresh_beta: XFetch aggressiveness, 0 disables early refresh
+            empty_ttl: Expiration of the "no tasks" marker in seconds
+            page_ttl: Expiration of cached pages in seconds
         """
         self.aioredis = _aioredis
+        self.codec = codec or JsonTaskCodec()
+        self.ttl = ttl
+        self.local_cache = local_cache
+        self.early_refresh_beta = early_refresh_beta
+        self.empty_ttl = empty_ttl
+        self.page_ttl = page_ttl
+        self._patch_tasks = self.aioredis.register_script(PATCH_TASKS_SCRIPT)
+        self._release_lock = self.aioredis.register_script(RELEASE_LOCK_SCRIPT)
+
+    @staticmethod
+    def _hash_key(user_id: UUID) -> str:
+        return f"user_tasks_by_id:{user_id}"
+
+    @staticmethod
+    def _order_key(user_id: UUID) -> str:
+        return f"user_tasks_order:{user_id}"
+
+    @staticmethod
+    def _empty_key(user_id: UUID) -> str:
+        return f"user_tasks_empty:{user_id}"
+
+    @staticmethod
+    def _meta_key(user_id: UUID) -> str:
+        return f"user_tasks_meta:{user_id}"
+
+    @staticmethod
+    def _pages_key(user_id: UUID) -> str:
+        return f"user_tasks_pages:{user_id}"
 
-    async def get_user_tasks(self, user_id: UUID) -> list[TaskResponse]:
+    @staticmethod
+    def _lock_key(user_id: UUID) -> str:
+        return f"user_tasks_lock:{user_id}"
+
+    @staticmethod
+    def _version_key(user_id: UUID) -> str:
+        return f"user_tasks_version:{user_id}"
+
+    def _write_keys(self, user_id: UUID) -> list[str]:
+        return [
+            self._hash_key(user_id),
+            self._order_key(user_id),
+            self._empty_key(user_id),
+            self._meta_key(user_id),
+            self._pages_key(user_id),
+        ]
+
+    async def get_user_tasks(self, user_id: UUID) -> Optional[list[TaskResponse]]:
         """Retrieve all user's tasks from cache.
 
         Args:
             user_id: User ID
 
         Returns:
-            List of TaskResponse objects if cache exists, empty list otherwise
+            List of TaskResponse objects if cache exists (empty if the user
+            is known to have no tasks), None otherwise
+        """
+        return (await self.lookup_user_tasks(user_id)).tasks
+
+    async def lookup_user_tasks(self, user_id: UUID) -> TaskCacheLookup:
+        """Retrieve user's tasks together with the early refresh decision.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            TaskCacheLookup: Cached tasks (None on miss) and refresh flag
+        """
+        payload, refresh_due = await self.lookup_user_tasks_json(user_id)
+        if payload is None:
+            return TaskCacheLookup(None)
+        return TaskCacheLookup(_task_list_adapter.validate_json(payload), refresh_due)
+
+    async def lookup_user_tasks_json(self, user_id: UUID) -> TaskCacheJsonLookup:
+        """Retrieve user's tasks as a ready JSON array, without parsing them.
+
+        The tasks, their order, remaining TTL and the duration of the last
+        rebuild are fetched in a single round trip, and the stored documents
+        are joined as they are.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            TaskCacheJsonLookup: JSON array of cached tasks (None on miss) and refresh flag
+        """
+        if self.local_cache:
+            if (payload := self.local_cache.get(user_id)) is not None:
+                task_cache_lookups.labels(tier="local", result="hit").inc()
+                if payload == EMPTY_TASKS_JSON:
+                    task_cache_stats.negative_hits += 1
+                return TaskCacheJsonLookup(payload)
+            task_cache_lookups.labels(tier="local", result="miss").inc()
+
+        fields, order, ttl_ms, recompute_time, empty = await self._fetch_user_tasks(user_id)
+
+        if empty:
+            task_cache_lookups.labels(tier="redis", result="hit").inc()
+            task_cache_stats.negative_hits += 1
+            if self.local_cache:
+                self.local_cache.set(user_id, EMPTY_TASKS_JSON)
+            return TaskCacheJsonLookup(EMPTY_TASKS_JSON)
+
+        documents = [
+            self.codec.decode_task_json(fields[task_id]) if task_id in fields else None
+            for task_id in order
+        ]
+        if not fields or len(order) != len(fields) or None in documents:
+            task_cache_lookups.labels(tier="redis", result="miss").inc()
+            return TaskCacheJsonLookup(None)
+
+        task_cache_lookups.labels(tier="redis", result="hit").inc()
+        payload = b"[" + b",".join(documents) + b"]"
+        if self.local_cache:
+            self.local_cache.set(user_id, payload)
+        return TaskCacheJsonLookup(payload, self._refresh_due(ttl_ms, recompute_time))
+
+    @observe_redis("lookup_user_tasks")
+    async def _fetch_user_tasks(self, user_id: UUID) -> list:
+        hash_key = self._hash_key(user_id)
+        async with self.aioredis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(hash_key)
+            pipe.zrange(self._order_key(user_id), 0, -1)
+            pipe.pttl(hash_key)
+            pipe.get(self._meta_key(user_id))
+            pipe.exists(self._empty_key(user_id))
+            return await pipe.execute()
+
+    def _refresh_due(self, ttl_ms: int, recompute_time: Optional[bytes]) -> bool:
+        """XFetch: recompute early with probability growing towards expiry."""
+        if self.early_refresh_beta <= 0 or ttl_ms < 0 or recompute_time is None:
+            return False
+        delta = float(recompute_time)
+        gap = -delta * self.early_refresh_beta * math.log(1.0 - random.random())
+        return gap >= ttl_ms / 1000
+
+    @observe_redis("get_version")
+    async def get_version(self, user_id: UUID) -> int:
+        """Return the user's write version, to be passed to set_users_task or set_page.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            int: Number of writes seen within the version's TTL, 0 if none
         """
-        cache_key = f"user_tasks:{user_id}"
-
-        async with self.aioredis as redis:
-            tasks_data = await redis.lrange(cache_key, 0, -1)
-            return (
-                [
-                    TaskResponse.model_validate(json.loads(task.decode("utf-8")))
-                    for task in tasks_data
-                ]
-                if tasks_data
-                else []
-            )
-
-    async def set_users_task(self, user_id: UUID, tasks: list[TaskResponse]) -> None:
-        """Cache a list of tasks with 5 minute expiration.
+        return int(await self.aioredis.get(self._version_key(user_id)) or 0)
+
+    @observe_redis("set_users_task")
+    async def set_users_task(
+        self,
+        user_id: UUID,
+        tasks: list[TaskResponse],
+        recompute_time: Optional[float] = None,
+        version: Optional[int] = None,
+    ) -> bool:
+        """Replace the cached task list in one round trip.
 
         Args:
             tasks: List of TaskResponse objects to cache
             user_id: User ID
+            recompute_time: Seconds it took to build tasks, used for early refresh
+            version: Result of get_version taken before tasks were read. If
+                the user's tasks were written since, nothing is stored.
+                None stores unconditionally.
+
+        Returns:
+            bool: True if the list was stored, False if a write raced with it
 
         Note:
-            If empty list is provided, cache will be invalidated
+            If empty list is provided, the "no tasks" marker is cached instead
+        """
+        hash_key, order_key, empty_key, meta_key, _ = self._write_keys(user_id)
+        version_key = self._version_key(user_id)
+        documents = [task.model_dump_json().encode("utf-8") for task in tasks]
+        fields = {
+            str(task.task_id): self.codec.encode_task_json(document)
+            for task, document in zip(tasks, documents)
+        }
+
+        async with self.aioredis.pipeline(transaction=True) as pipe:
+            if version is not None:
+                await pipe.watch(version_key)
+                if int(await pipe.get(version_key) or 0) != version:
+                    return False
+                pipe.multi()
+            pipe.delete(hash_key, order_key, empty_key, meta_key)
+            if not tasks:
+                pipe.set(empty_key, 1, ex=self.empty_ttl)
+                task_cache_stats.negative_stores += 1
+            else:
+                pipe.hset(hash_key, mapping=fields)
+                pipe.zadd(order_key, {task_id: i for i, task_id in enumerate(fields)})
+                pipe.expire(hash_key, self.ttl)
+                pipe.expire(order_key, self.ttl)
+                if recompute_time is not None:
+                    pipe.set(meta_key, recompute_time, ex=self.ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+
+        if self.local_cache:
+            self.local_cache.set(user_id, b"[" + b",".join(documents) + b"]")
+        return True
+
+    @observe_redis("get_page")
+    async def get_page(self, user_id: UUID, page_id: str) -> Optional[bytes]:
+        """Retrieve a cached page of user's tasks.
+
+        Args:
+            user_id: User ID
+            page_id: Digest identifying the filters, sort and cursor of the page
+
+        Returns:
+            Optional[bytes]: Serialized page, None on miss
         """
-        cache_key = f"user_tasks:{str(user_id)}"
+        return await self.aioredis.hget(self._pages_key(user_id), page_id)
 
-        if not tasks:
-            await self.invalidate_user_cache(user_id=user_id)
-            return
+    @observe_redis("set_page")
+    async def set_page(
+        self, user_id: UUID, page_id: str, payload: bytes, version: Optional[int] = None
+    ) -> bool:
+        """Cache a serialized page of user's tasks.
 
-        tasks_json = [task.model_dump_json() for task in tasks]
-        async with self.aioredis as redis:
-            await redis.delete(cache_key)
-            await redis.rpush(cache_key, *tasks_json)
-            await redis.expire(cache_key, 300)
+        Args:
+            user_id: User ID
+            page_id: Digest identifying the filters, sort and cursor of the page
+            payload: Serialized page
+            version: Result of get_version taken before the page was read. If
+                the user's tasks were written since, nothing is stored.
+                None stores unconditionally.
+
+        Returns:
+            bool: True if the page was stored, False if a write raced with it
+        """
+        pages_key = self._pages_key(user_id)
+        version_key = self._version_key(user_id)
+        async with self.aioredis.pipeline(transaction=True) as pipe:
+            if version is not None:
+                await pipe.watch(version_key)
+                if int(await pipe.get(version_key) or 0) != version:
+                    return False
+                pipe.multi()
+            pipe.hset(pages_key, page_id, payload)
+            pipe.expire(pages_key, self.page_ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
 
-    async def add_task(self, user_id: UUID, task: TaskResponse) -> None:
-        """Append single task to existing cache.
+    async def add_task(self, user_id: UUID, task: TaskResponse) -> bool:
+        """Append a new task to the cached list.
 
         Args:
             task: TaskResponse object to add to cache
             user_id: User ID
+
+        Returns:
+            bool: True if the cache was patched, False if nothing was cached
         """
-        cache_key = f"user_tasks:{str(user_id)}"
+        return await self.update_task(user_id=user_id, task=task)
 
-        async with self.aioredis as redis:
-            await redis.rpush(cache_key, task.model_dump_json())
+    async def update_task(self, user_id: UUID, task: TaskResponse) -> bool:
+        """Write a task into the cached list, keeping its position if present.
 
+        Args:
+            task: TaskResponse object with the current task state
+            user_id: User ID
+
+        Returns:
+            bool: True if the cache was patched, False if nothing was cached
+        """
+        return await self.apply_changes(user_id=user_id, upserted=[task])
+
+    async def remove_task(self, user_id: UUID, task_id: UUID) -> bool:
+        """Remove a task from the cached list.
+
+        Args:
+            task_id: ID of the deleted task
+            user_id: User ID
+
+        Returns:
+            bool: True if the cache was patched, False if nothing was cached
+        """
+        return await self.apply_changes(user_id=user_id, removed=[task_id])
+
+    @observe_redis("apply_changes")
+    async def apply_changes(
+        self,
+        user_id: UUID,
+        upserted: Sequence[TaskResponse] = (),
+        removed: Sequence[UUID] = (),
+    ) -> bool:
+        """Patch the cached list with a batch of writes in one round trip.
+
+        Args:
+            user_id: User ID
+            upserted: Created or updated tasks in their current state
+            removed: IDs of deleted tasks
+
+        Returns:
+            bool: True if the cache was patched, False if nothing was cached
+        """
+        self._invalidate_local(user_id)
+        args = [self.ttl, self.empty_ttl, INVALIDATION_CHANNEL, str(user_id), len(upserted)]
+        for task in upserted:
+            args += [str(task.task_id), self.codec.encode_task(task)]
+        args += [str(task_id) for task_id in removed]
+        patched = await self._patch_tasks(
+            keys=[*self._write_keys(user_id), self._version_key(user_id)], args=args
+        )
+        return bool(patched)
+
+    @observe_redis("invalidate_user_cache")
     async def invalidate_user_cache(self, user_id: UUID) -> None:
-        """Clear all cached task data."""
-        async with self.aioredis as redis:
-            await redis.delete(str(user_id))
+        """Drop the cached task list of the user in Redis and every worker."""
+        self._invalidate_local(user_id)
+        version_key = self._version_key(user_id)
+        async with self.aioredis.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._write_keys(user_id))
+            pipe.incr(version_key)
+            pipe.expire(version_key, self.ttl)
+            pipe.publish(INVALIDATION_CHANNEL, str(user_id))
+            await pipe.execute()
+
+    @observe_redis("acquire_rebuild_lock")
+    async def acquire_rebuild_lock(
+        self, user_id: UUID, timeout: int = settings.CACHE_REBUILD_LOCK_TTL
+    ) -> Optional[str]:
+        """Try to become the only loader of the user's tasks across workers.
+
+        Args:
+            user_id: User ID
+            timeout: Lock lifetime in milliseconds, bounds a crashed loader
+
+        Returns:
+            Optional[str]: Token to release the lock with, None if held elsewhere
+        """
+        token = secrets.token_hex(8)
+        acquired = await self.aioredis.set(self._lock_key(user_id), token, nx=True, px=timeout)
+        return token if acquired else None
+
+    @observe_redis("release_rebuild_lock")
+    async def release_rebuild_lock(self, user_id: UUID, token: str) -> None:
+        """Release the rebuild lock if it is still held by token."""
+        await self._release_lock(keys=[self._lock_key(user_id)], args=[token])
+
+    async def wait_for_rebuild(
+        self, user_id: UUID, timeout: float, poll_interval: float = 0.05
+    ) -> None:
+        """Wait until another loader releases the rebuild lock or timeout passes."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not await self.aioredis.exists(self._lock_key(user_id)):
+                return
+            await asyncio.sleep(poll_interval)
+
+    def _invalidate_local(self, user_id: UUID) -> None:
+        if self.local_cache:
+            self.local_cache.invalidate(user_id)
@@ -1,26 +1,70 @@
 from contextlib import asynccontextmanager
 from uuid import UUID
-from sqlalchemy import select, update, delete, insert
-from typing import Any, Optional
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    insert,
+    tuple_,
+    values,
+    column,
+    any_,
+    bindparam,
+    cast,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.engine import Row
+from typing import Any, AsyncIterator, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from database import AsyncSessionFactory
-from schema import TaskCreate, TaskUpdate
+from database import (
+    AsyncSessionFactory,
+    ReplicaRouter,
+    UnitOfWork,
+    trace_query_origin,
+)
+from schema import TaskCreate, TaskUpdate, TaskQuery, TaskSortField
 from models import Task, Category
 
 
+@trace_query_origin
 class TaskRepository:
     """Repository for database operations related to tasks."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        unit_of_work: Optional[UnitOfWork] = None,
+        read_unit_of_work: Optional[UnitOfWork] = None,
+        replica_router: Optional[ReplicaRouter] = None,
+    ):
+        """
+        Args:
+            unit_of_work: Request-scoped unit of work whose session is shared
+                with other repositories; without it every call runs in its
+                own session and transaction
+            read_unit_of_work: Unit of work on the read replica used by read
+                methods; without it reads go to the primary
+            replica_router: Sends reads back to the primary while the user is
+                pinned after a write; without it reads always use the replica
+        """
         self.session_factory = AsyncSessionFactory
+        self.unit_of_work = unit_of_work
+        self.read_unit_of_work = read_unit_of_work
+        self.replica_router = replica_router
 
     @asynccontextmanager
     async def _session_scope(self) -> AsyncSession:
         """Context manager for handling database sessions.
 
-        Provides automatic transaction management with commit/rollback
-        and proper session cleanup.
+        Reuses the unit of work's session if the repository is bound to one,
+        leaving commit/rollback to its owner. Otherwise provides automatic
+        transaction management with commit/rollback and proper session cleanup.
         """
+        if self.unit_of_work is not None:
+            yield self.unit_of_work.session
+            return
+
         async with self.session_factory() as session:
             try:
                 session.expire_on_commit = False
@@ -30,6 +74,25 @@ class TaskRepository:
                 await session.rollback()
                 raise
 
+    async def _reads_on_replica(self) -> bool:
+        if self.read_unit_of_work is None:
+            return False
+        return self.replica_router is None or await self.replica_router.use_replica()
+
+    @asynccontextmanager
+    async def _read_scope(self) -> AsyncSession:
+        """Context manager for read-only queries.
+
+        Yields the replica session when reads may go to the replica, and
+        falls back to _session_scope on the primary otherwise.
+        """
+        if await self._reads_on_replica():
+            yield self.read_unit_of_work.session
+            return
+
+        async with self._session_scope() as session:
+            yield session
+
     async def _get_task(self, *filters: Any) -> Optional[Task]:
         """Generic method to retrieve a single task matching given filters.
 
@@ -39,7 +102,7 @@ class TaskRepository:
         Returns:
             Optional[Task]: Task object if found, None otherwise
         """
-        async with self._session_scope() as session:
+        async with self._read_scope() as session:
             stmt = select(Task).where(*filters)
             return (await session.scalars(stmt)).one_or_none()
 
@@ -86,10 +149,114 @@ class TaskRepository:
         Returns:
             list[Task]: List of all tasks
         """
-        async with self._session_scope() as session:
+        async with self._read_scope() as session:
             stmt = select(Task).where(Task.user_id == user_id)
             return (await session.scalars(stmt)).all()
 
+    async def get_user_task_rows(self, user_id: UUID) -> Sequence[Row]:
+        """Retrieve all user's tasks as plain rows, skipping ORM hydration.
+
+        Selects only the columns of TaskResponse, so no Task instances are
+        built or tracked in the identity map. Use it for read-only listings.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            Sequence[Row]: Rows with task_id, user_id, name, pomodoro_count and category_id
+        """
+        async with self._read_scope() as session:
+            stmt = select(
+                Task.task_id,
+                Task.user_id,
+                Task.name,
+                Task.pomodoro_count,
+                Task.category_id,
+            ).where(Task.user_id == user_id)
+            return (await session.execute(stmt)).all()
+
+    async def get_user_tasks_page(
+        self, user_id: UUID, query: TaskQuery, after: Optional[tuple[Any, UUID]] = None
+    ) -> list[Task]:
+        """Retrieve one page of user's tasks using keyset pagination.
+
+        Tasks are ordered by (sort key, task_id), which matches the composite
+        (user_id, sort key, task_id) indexes, so every page is an index range
+        scan regardless of how deep it is.
+
+        Args:
+            user_id: ID of the user
+            query: Filters, sort key, direction and page size
+            after: (sort key value, task_id) of the last task of the previous page
+
+        Returns:
+            list[Task]: Up to query.limit + 1 tasks, the extra one signals more pages
+        """
+        by_task_id = query.sort is TaskSortField.task_id
+        sort_column = getattr(Task, query.sort.value)
+        stmt = select(Task).where(Task.user_id == user_id)
+
+        if query.category_id is not None:
+            stmt = stmt.where(Task.category_id == query.category_id)
+        if query.min_pomodoro_count is not None:
+            stmt = stmt.where(Task.pomodoro_count >= query.min_pomodoro_count)
+        if query.max_pomodoro_count is not None:
+            stmt = stmt.where(Task.pomodoro_count <= query.max_pomodoro_count)
+
+        descending = query.order == "desc"
+        if after is not None:
+            if by_task_id:
+                key, bound = Task.task_id, after[1]
+            else:
+                key, bound = tuple_(sort_column, Task.task_id), tuple_(*after)
+            stmt = stmt.where(key < bound if descending else key > bound)
+
+        order_by = [Task.task_id] if by_task_id else [sort_column, Task.task_id]
+        if descending:
+            order_by = [column.desc() for column in order_by]
+        stmt = stmt.order_by(*order_by).limit(query.limit + 1)
+
+        async with self._read_scope() as session:
+            return (await session.scalars(stmt)).all()
+
+    async def stream_user_tasks(
+        self, user_id: UUID, batch_size: int = 1000
+    ) -> AsyncIterator[Task]:
+        """Iterate over all user's tasks through a server-side cursor.
+
+        Rows are fetched batch_size at a time, so memory stays flat no matter
+        how many tasks the user has. The iteration always uses a session of
+        its own, open until the iteration is finished or closed, since a
+        streamed response outlives the request's unit of work. The session
+        comes from the factory of the unit of work the read would otherwise
+        use, so overriding that unit of work redirects the export as well.
+
+        Args:
+            user_id: ID of the user
+            batch_size: Number of rows fetched from the cursor at once
+
+        Yields:
+            Task: User's tasks ordered by task_id
+        """
+        if await self._reads_on_replica():
+            session_factory = self.read_unit_of_work.session_factory
+        elif self.unit_of_work is not None:
+            session_factory = self.unit_of_work.session_factory
+        else:
+            session_factory = self.session_factory
+        async with session_factory() as session:
+            # Server-side cursors only live inside a transaction, which the
+            # AUTOCOMMIT replica and read-only sessions never open.
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            stmt = (
+                select(Task)
+                .where(Task.user_id == user_id)
+                .order_by(Task.task_id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for task in await session.stream_scalars(stmt):
+                yield task
+
     async def get_tasks_by_category(self, category_name: str) -> list[Task]:
         """Retrieve all tasks belonging to a specific category.
 
@@ -99,7 +266,7 @@ class TaskRepository:
         Returns:
             list[Task]: List of tasks in the specified category
         """
-        async with self._session_scope() as session:
+        async with self._read_scope() as session:
             stmt = (
                 select(Task)
                 .join(Category, Task.category_id == Category.category_id)
@@ -107,44 +274,61 @@ class TaskRepository:
             )
             return (await session.scalars(stmt)).all()
 
-    async def create_task(self, task: TaskCreate, user_id: UUID) -> UUID:
-        """Retrieve all tasks from the database.
+    async def create_task(self, task: TaskCreate, user_id: UUID) -> Task:
+        """Insert a new task and return the stored row in one statement.
+
+        Args:
+            task: Data of the new task
+            user_id: ID of the owner
 
         Returns:
-            list[Task]: List of all tasks
+            Task: Created task with its generated task_id
         """
         async with self._session_scope() as session:
-            task_model = Task(
-                name=task.name,
-                pomodoro_count=task.pomodoro_count,
-                category_id=task.category_id,
-                user_id=user_id,
+            stmt = (
+                insert(Task)
+                .values(
+                    name=task.name,
+                    pomodoro_count=task.pomodoro_count,
+                    category_id=task.category_id,
+                    user_id=user_id,
+                )
+                .returning(Task)
             )
+            return (await session.scalars(stmt)).one()
 
-            session.add(task_model)
-            await session.flush()
-            return task_model.task_id
+    async def delete_task(self, task_id: UUID, user_id: UUID) -> Optional[UUID]:
+        """Delete a user's task in one ownership-checked statement.
 
-    async def delete_task(self, task_id: UUID, user_id: UUID) -> None:
-        """Retrieve all tasks from the database.
+        Args:
+            task_id: UUID of the task to delete
+            user_id: ID of the owner
 
         Returns:
-            list[Task]: List of all tasks
+            Optional[UUID]: ID of the deleted task, None if the user has no such task
         """
         async with self._session_scope() as session:
-            stmt = delete(Task).where(Task.task_id == task_id, Task.user_id == user_id)
-            await session.execute(stmt)
+            stmt = (
+                delete(Task)
+                .where(Task.task_id == task_id, Task.user_id == user_id)
+                .returning(Task.task_id)
+            )
+            return (await session.scalars(stmt)).one_or_none()
+
+    async def update_task(self, task_update: TaskUpdate, user_id: UUID) -> Optional[Task]:
+        """Update a user's task in one ownership-checked statement.
 
-    async def update_task(self, task_update: TaskUpdate) -> Task:
-        """Retrieve all tasks from the database.
+        Args:
+            task_update: New state of the task
+            user_id: ID of the owner
 
         Returns:
-            list[Task]: List of all tasks
+            Optional[Task]: Updated task, None if the user has no such task
         """
         async with self._session_scope() as session:
             stmt = (
                 update(Task)
-                .where(Task.task_id == task_update.task_id)
+                .where(Task.task_id == task_update.task_id, Task.user_id == user_id)
                 .values(
                     name=task_update.name,
                     category_id=task_update.category_id,
@@ -153,3 +337,89 @@ class TaskRepository:
                 .returning(Task)
             )
             return (await session.scalars(stmt)).one_or_none()
+
+    async def bulk_write(
+        self,
+        user_id: UUID,
+        tasks_create: list[TaskCreate],
+        tasks_update: list[TaskUpdate],
+        tasks_delete: list[UUID],
+    ) -> tuple[list[Task], list[Task], list[UUID]]:
+        """Apply a batch of user's task writes in one transaction.
+
+        Each kind of write is a single multi-row statement: INSERT ...
+        RETURNING, UPDATE ... FROM (VALUES ...) RETURNING and DELETE ...
+        WHERE task_id = ANY(...) RETURNING. Updates and deletes only touch
+        tasks owned by the user.
+
+        Args:
+            user_id: ID of the user
+            tasks_create: Tasks to create
+            tasks_update: Tasks to update
+            tasks_delete: IDs of tasks to delete
+
+        Returns:
+            tuple: Created tasks (in request order), updated tasks and IDs of
+            deleted tasks; missing or foreign tasks are absent from the last two
+        """
+        async with self._session_scope() as session:
+            created, updated, deleted = [], [], []
+
+            if tasks_create:
+                stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+                created = (
+                    await session.scalars(
+                        stmt,
+                        [
+                            {
+                                "name": task.name,
+                                "pomodoro_count": task.pomodoro_count,
+                                "category_id": task.category_id,
+                                "user_id": user_id,
+                            }
+                            for task in tasks_create
+                        ],
+                    )
+                ).all()
+
+            if tasks_update:
+                rows = values(
+                    column("task_id", PG_UUID(as_uuid=True)),
+                    column("name", String),
+                    column("pomodoro_count", Integer),
+                    column("category_id", PG_UUID(as_uuid=True)),
+                    name="task_updates",
+                ).data(
+                    [
+                        (task.task_id, task.name, task.pomodoro_count, task.category_id)
+                        for task in tasks_update
+                    ]
+                )
+                stmt = (
+                    update(Task)
+                    .where(Task.task_id == rows.c.task_id, Task.user_id == user_id)
+                    .values(
+                        name=rows.c.name,
+                        pomodoro_count=rows.c.pomodoro_count,
+                        # SQLAlchemy renders None in VALUES as a bare NULL,
+                        # which PostgreSQL types as text if no row sets it.
+                        category_id=cast(rows.c.category_id, PG_UUID(as_uuid=True)),
+                    )
+                    .returning(Task)
+                    .execution_options(synchronize_session=False)
+                )
+                updated = (await session.scalars(stmt)).all()
+
+            if tasks_delete:
+                task_ids = bindparam(
+                    "task_ids", tasks_delete, type_=ARRAY(PG_UUID(as_uuid=True))
+                )
+                stmt = (
+                    delete(Task)
+                    .where(Task.user_id == user_id, Task.task_id == any_(task_ids))
+                    .returning(Task.task_id)
+                    .execution_options(synchronize_session=False)
+                )
+                deleted = (await session.scalars(stmt)).all()
+
+            return list(created), list(updated), list(deleted)
@@ -6,9 +6,10 @@ from typing import Any, Optional
 
 from models import UserProfile
 from schema import UserCreateSchema
-from database import AsyncSessionFactory
+from database import AsyncSessionFactory, UnitOfWork, trace_query_origin
 
 
+@trace_query_origin
 class UserRepository:
     """Repository for database operations related to users.
 
@@ -16,16 +17,28 @@ class UserRepository:
     using SQLAlchemy AsyncSession for database operations.
     """
 
-    def __init__(self):
+    def __init__(self, unit_of_work: Optional[UnitOfWork] = None):
+        """
+        Args:
+            unit_of_work: Request-scoped unit of work whose session is shared
+                with other repositories; without it every call runs in its
+                own session and transaction
+        """
         self.session_factory = AsyncSessionFactory
+        self.unit_of_work = unit_of_work
 
     @asynccontextmanager
     async def _session_scope(self) -> AsyncSession:
         """Context manager for handling database sessions.
 
-        Provides automatic transaction management with commit/rollback
-        and proper session cleanup.
+        Reuses the unit of work's session if the repository is bound to one,
+        leaving commit/rollback to its owner. Otherwise provides automatic
+        transaction management with commit/rollback and proper session cleanup.
         """
+        if self.unit_of_work is not None:
+            yield self.unit_of_work.session
+            return
+
         async with self.session_factory() as session:
             try:
                 session.expire_on_commit = False
@@ -76,6 +89,21 @@ class UserRepository:
                 print(f"Error creating user: {e}")
                 raise
 
+    async def update_password(self, user_id: UUID, password: str) -> None:
+        """Replace the stored password of a user.
+
+        Args:
+            user_id: ID of the user
+            password: New password hash
+        """
+        async with self._session_scope() as session:
+            stmt = (
+                update(UserProfile)
+                .where(UserProfile.user_id == user_id)
+                .values(password=password)
+            )
+            await session.execute(stmt)
+
     async def _get_user(self, *filters: Any) -> Optional[UserProfile]:
         """Internal method to retrieve a single user matching given filters.
 
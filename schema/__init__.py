@@ -1,4 +1,14 @@
-from schema.task import TaskCreate, TaskResponse, TaskUpdate
+from schema.task import (
+    TaskCreate,
+    TaskResponse,
+    TaskUpdate,
+    TaskSortField,
+    TaskQuery,
+    TaskPage,
+    TaskBulkRequest,
+    TaskBulkItemResult,
+    TaskBulkResponse,
+)
 from schema.category import CategoryCreate, CategoryResponse
 from schema.user import UserLoginSchema, UserCreateSchema
 from schema.google import GoogleUserData
@@ -7,6 +17,12 @@ __all__ = [
     "TaskCreate",
     "TaskResponse",
     "TaskUpdate",
+    "TaskSortField",
+    "TaskQuery",
+    "TaskPage",
+    "TaskBulkRequest",
+    "TaskBulkItemResult",
+    "TaskBulkResponse",
     "CategoryCreate",
     "CategoryResponse",
     "UserLoginSchema",
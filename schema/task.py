@@ -1,6 +1,7 @@
-from typing import Optional
+from enum import Enum
+from typing import Iterable, Literal, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class TaskBase(BaseModel):
@@ -25,3 +26,85 @@ class TaskResponse(TaskBase):
 
 class TaskUpdate(TaskBase):
     task_id: UUID
+
+
+class TaskSortField(str, Enum):
+    task_id = "task_id"
+    name = "name"
+    pomodoro_count = "pomodoro_count"
+
+
+class TaskQuery(BaseModel):
+    """Filtering, sorting and keyset pagination of a user's task list.
+
+    Attributes:
+        limit: Maximum number of tasks in a page
+        cursor: Opaque cursor returned as next_cursor by the previous page
+        category_id: Only tasks of this category
+        min_pomodoro_count: Only tasks with at least this many pomodoros
+        max_pomodoro_count: Only tasks with at most this many pomodoros
+        sort: Sort key, ties are broken by task_id
+        order: Sort direction
+    """
+
+    limit: int = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = None
+    category_id: Optional[UUID] = None
+    min_pomodoro_count: Optional[int] = Field(None, ge=0)
+    max_pomodoro_count: Optional[int] = Field(None, ge=0)
+    sort: TaskSortField = TaskSortField.task_id
+    order: Literal["asc", "desc"] = "asc"
+
+
+class TaskPage(BaseModel):
+    items: list[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkRequest(BaseModel):
+    """Batch of task writes applied in one transaction.
+
+    A task ID may appear at most once in update and once in delete, so every
+    item gets exactly one result.
+
+    Attributes:
+        create: Tasks to create
+        update: Tasks to update
+        delete: IDs of tasks to delete
+    """
+
+    create: list[TaskCreate] = Field(default_factory=list, max_length=1000)
+    update: list[TaskUpdate] = Field(default_factory=list, max_length=1000)
+    delete: list[UUID] = Field(default_factory=list, max_length=1000)
+
+    @field_validator("update")
+    @classmethod
+    def unique_update_ids(cls, tasks: list[TaskUpdate]) -> list[TaskUpdate]:
+        _reject_duplicate_ids(task.task_id for task in tasks)
+        return tasks
+
+    @field_validator("delete")
+    @classmethod
+    def unique_delete_ids(cls, task_ids: list[UUID]) -> list[UUID]:
+        _reject_duplicate_ids(task_ids)
+        return task_ids
+
+
+def _reject_duplicate_ids(task_ids: Iterable[UUID]) -> None:
+    """Raise if a task is listed twice, since its single result would be ambiguous."""
+    seen = set()
+    for task_id in task_ids:
+        if task_id in seen:
+            raise ValueError(f"duplicate task_id {task_id}")
+        seen.add(task_id)
+
+
+class TaskBulkItemResult(BaseModel):
+    operation: Literal["create", "update", "delete"]
+    status: Literal["created", "updated", "deleted", "not_found"]
+    task_id: Optional[UUID] = None
+    task: Optional[TaskResponse] = None
+
+
+class TaskBulkResponse(BaseModel):
+    items: list[TaskBulkItemResult]
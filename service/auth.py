@@ -1,9 +1,11 @@
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from os import access
 from uuid import UUID
 from jose import jwt, JWTError, ExpiredSignatureError
 
+from cache.token import verified_token_cache
 from client.google_client import GoogleClient
 from exception import (
     UserNotFoundException,
@@ -14,6 +16,7 @@ from exception import (
 from models import UserProfile
 from repository import UserRepository
 from schema import UserLoginSchema, GoogleUserData, UserCreateSchema
+from service.password import PasswordHasher
 from settings import Settings
 
 
@@ -24,11 +27,13 @@ class AuthService:
     Attributes:
         user_repository: Repository for user data access
         settings: Application settings containing JWT configuration
+        password_hasher: Hashes and verifies passwords off the event loop
     """
 
     user_repository: UserRepository
     settings: Settings
     google_client: GoogleClient
+    password_hasher: PasswordHasher
 
     async def google_auth(self, code: str):
         user_data: GoogleUserData = await self.google_client.get_user_info(code=code)
@@ -56,6 +61,9 @@ class AuthService:
     async def login(self, username: str, password: str) -> UserLoginSchema:
         """Authenticate user and return access token.
 
+        Passwords stored in plaintext or hashed with outdated parameters are
+        rehashed on successful login.
+
         Args:
             username: User's login name
             password: User's plaintext password
@@ -66,12 +74,25 @@ class AuthService:
         Raises:
             UserNotFoundException: If user doesn't exist
             UserUnCorrectPasswordException: If password doesn't match
+            PasswordHasherBusyException: If too many logins are in progress
         """
         user = await self.user_repository.get_user_by_username(username)
-        self._validate_user(user=user, password=password)
+        await self._validate_user(user=user, password=password)
+        if self.password_hasher.needs_rehash(user.password):
+            await self.user_repository.update_password(
+                user.user_id, await self.hash_password(password)
+            )
         access_token = self.generate_access_token(user_id=user.user_id)
         return UserLoginSchema(user_id=user.user_id, access_token=access_token)
 
+    async def hash_password(self, password: str) -> str:
+        """Hash a password for storage.
+
+        Raises:
+            PasswordHasherBusyException: If too many hashes are in progress
+        """
+        return await self.password_hasher.hash(password)
+
     def generate_access_token(self, user_id: UUID) -> str:
         """Generate JWT token for authenticated user.
 
@@ -97,6 +118,8 @@ class AuthService:
 
         Decodes the JWT token using the application's secret key and algorithm,
         verifies token expiration, and extracts the user ID from the payload.
+        Tokens verified before are answered from the per-worker verified
+        token cache until they expire.
 
         Args:
             access_token: JWT access token string
@@ -108,21 +131,31 @@ class AuthService:
             TokenExpiredException: If the token has expired
             InvalidTokenException: If the token is invalid, malformed, or signature verification fails
         """
+        secret, algorithm = self.settings.JWT_SECRET, self.settings.JWT_ALGORITHM
+        if user_id := verified_token_cache.get(access_token, secret, algorithm):
+            return user_id
+
+        started = time.perf_counter()
         try:
             payload = jwt.decode(
                 token=access_token,
-                key=self.settings.JWT_SECRET,
-                algorithms=self.settings.JWT_ALGORITHM,
+                key=secret,
+                algorithms=algorithm,
                 options={"verify_exp": True},
             )
-            return UUID(payload["user_id"])
         except ExpiredSignatureError:
             raise TokenExpiredException
         except JWTError:
             raise InvalidTokenException
+        finally:
+            verified_token_cache.record_verification(time.perf_counter() - started)
+
+        user_id = UUID(payload["user_id"])
+        if (exp := payload.get("exp")) is not None:
+            verified_token_cache.set(access_token, secret, algorithm, user_id, float(exp))
+        return user_id
 
-    @staticmethod
-    def _validate_user(user: UserProfile, password: str) -> None:
+    async def _validate_user(self, user: UserProfile, password: str) -> None:
         """Validate user credentials.
 
         Args:
@@ -135,5 +168,5 @@ class AuthService:
         """
         if not user:
             raise UserNotFoundException
-        if user.password != password:
+        if not await self.password_hasher.verify(password, user.password):
             raise UserUnCorrectPasswordException
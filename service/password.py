@@ -0,0 +1,134 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from exception import PasswordHasherBusyException
+
+
+class PasswordHasher:
+    """scrypt password hashing off the event loop.
+
+    Hashes are stored as ``scrypt$n$r$p$salt$hash`` with base64 salt and hash.
+    hashlib.scrypt releases the GIL, so hashing runs on a small thread pool
+    and never blocks the event loop. At most workers hashes run at once and
+    at most max_queue more wait for a thread; further calls are rejected
+    right away instead of piling up during a login storm.
+
+    Passwords stored before hashing was introduced are plaintext. They still
+    verify, and needs_rehash tells the caller to replace them with a hash.
+
+    Attributes:
+        workers: Number of hashes computed concurrently
+        max_queue: Number of hashes allowed to wait for a free worker
+        n: scrypt CPU/memory cost
+        r: scrypt block size
+        p: scrypt parallelization
+    """
+
+    PREFIX = "scrypt"
+    SALT_SIZE = 16
+    KEY_SIZE = 32
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        n: int = 2**14,
+        r: int = 8,
+        p: int = 1,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.n = n
+        self.r = r
+        self.p = p
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = asyncio.Semaphore(workers)
+        self._pending = 0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with a random salt and the current parameters.
+
+        Raises:
+            PasswordHasherBusyException: If the queue of pending hashes is full
+        """
+        salt = secrets.token_bytes(self.SALT_SIZE)
+        key = await self._run(self._derive, password, salt, self.n, self.r, self.p)
+        return "$".join(
+            (
+                self.PREFIX,
+                str(self.n),
+                str(self.r),
+                str(self.p),
+                base64.b64encode(salt).decode("ascii"),
+                base64.b64encode(key).decode("ascii"),
+            )
+        )
+
+    async def verify(self, password: str, stored: Optional[str]) -> bool:
+        """Check a password against a stored hash or legacy plaintext password.
+
+        Raises:
+            PasswordHasherBusyException: If the queue of pending hashes is full
+        """
+        if stored is None:
+            return False
+        parsed = self._parse(stored)
+        if parsed is None:
+            return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        n, r, p, salt, expected = parsed
+        key = await self._run(self._derive, password, salt, n, r, p)
+        return hmac.compare_digest(key, expected)
+
+    def needs_rehash(self, stored: Optional[str]) -> bool:
+        """Return True if stored is plaintext or hashed with outdated parameters."""
+        parsed = self._parse(stored) if stored is not None else None
+        return parsed is None or parsed[:3] != (self.n, self.r, self.p)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func, *args):
+        if self._pending >= self.workers + self.max_queue:
+            raise PasswordHasherBusyException
+        self._pending += 1
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    def _parse(self, stored: str) -> Optional[tuple[int, int, int, bytes, bytes]]:
+        parts = stored.split("$")
+        if len(parts) != 6 or parts[0] != self.PREFIX:
+            return None
+        try:
+            return (
+                int(parts[1]),
+                int(parts[2]),
+                int(parts[3]),
+                base64.b64decode(parts[4]),
+                base64.b64decode(parts[5]),
+            )
+        except ValueError:
+            return None
+
+    @classmethod
+    def _derive(cls, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r + 1024 * 1024,
+            dklen=cls.KEY_SIZE,
+        )
@@ -11,6 +11,10 @@ class UserService:
     auth_service: AuthService
 
     async def create_user(self, user: UserCreateSchema) -> UserLoginSchema:
+        if user.password is not None:
+            user = user.model_copy(
+                update={"password": await self.auth_service.hash_password(user.password)}
+            )
         user_profile = await self.user_repository.create_user(user)
         access_token = self.auth_service.generate_access_token(user_id=user_profile.user_id)
         return UserLoginSchema(user_id=user_profile.user_id, access_token=access_token)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
-from typing import Literal
+from typing import Literal, Optional
 
 LOG_FORMAT_DEFAULT = (
     "[%(asctime)s.%(msecs)03d] %(module)10s:%(lineno)-3d %(levelname)-7s - %(message)s"
@@ -36,23 +36,122 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "pomodoro"
     DB_NAME: str = "pomodoro"
     DB_DRIVER: str = "postgresql+asyncpg"
+    DB_ECHO: bool = False
+    DB_CONNECTION_BUDGET: int = 80
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[int] = None
+    DB_READ_YOUR_WRITES_WINDOW: int = 5
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD: float = 0.2
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_EXPLAIN_FILE: str = "slow_queries.log"
+    SLOW_QUERY_EXPLAIN_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_EXPLAIN_BACKUP_COUNT: int = 5
 
     CACHE_HOST: str = "0.0.0.0"
     CACHE_PORT: int = 14000
     CACHE_DB: int = 0
+    CACHE_POOL_SIZE: int = 50
+    CACHE_POOL_TIMEOUT: float = 5.0
+    CACHE_SOCKET_TIMEOUT: float = 2.0
+    CACHE_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    CACHE_HEALTH_CHECK_INTERVAL: int = 30
+    CACHE_TASKS_TTL: int = 300
+    CACHE_EMPTY_TTL: int = 60
+    CACHE_PAGE_TTL: int = 60
+    CACHE_TASKS_CODEC: Literal["json", "compact"] = "json"
+    CACHE_COMPRESS_THRESHOLD: int = 64
+    CACHE_EARLY_REFRESH_BETA: float = 1.0
+    CACHE_REBUILD_LOCK_TTL: int = 5000
+    CACHE_REBUILD_WAIT: float = 2.0
+
+    LOCAL_CACHE_ENABLED: bool = True
+    LOCAL_CACHE_MAX_ENTRIES: int = 10_000
+    LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LOCAL_CACHE_TTL: float = 30.0
+
+    EXPORT_BATCH_SIZE: int = 1000
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_READ_CAPACITY: int = 120
+    RATE_LIMIT_READ_REFILL: float = 20.0
+    RATE_LIMIT_WRITE_CAPACITY: int = 30
+    RATE_LIMIT_WRITE_REFILL: float = 5.0
+
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHED_POOL_WAIT: float = 0.5
+    LOAD_SHED_LOOP_LAG: float = 0.2
+    LOAD_SHED_RETRY_AFTER: int = 1
+    LOOP_LAG_INTERVAL: float = 0.5
+
+    PROMETHEUS_MULTIPROC_DIR: str = "/tmp/pomodoro_prometheus"
 
     JWT_SECRET: str = "secret"
     JWT_ALGORITHM: str = "HS256"
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    PASSWORD_SCRYPT_N: int = 2**14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
 
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_REDIRECT_URI: str = ""
     GOOGLE_TOKEN_URL: str = "https://accounts.google.com/o/oauth2/token"
+    GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v1/userinfo"
+    GOOGLE_USERINFO_HEDGE_DELAY: Optional[float] = None
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    GOOGLE_JWKS_DEFAULT_TTL: int = 3600
+    GOOGLE_JWKS_REFRESH_MARGIN: int = 300
+    GOOGLE_JWKS_MIN_REFETCH_INTERVAL: int = 60
+
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_WRITE_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 2.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_RETRIES: int = 2
+    HTTP2_ENABLED: bool = True
 
     @property
     def db_url(self) -> str:
         return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def db_replica_url(self) -> Optional[str]:
+        """URL of the read replica, or None when reads share the primary."""
+        if self.DB_REPLICA_HOST is None:
+            return None
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}"
+
+    @property
+    def db_connections_per_worker(self) -> int:
+        """Share of the global DB_CONNECTION_BUDGET available to one gunicorn worker."""
+        return max(1, self.DB_CONNECTION_BUDGET // max(1, self.gunicorn.WORKERS))
+
+    @property
+    def db_pool_size(self) -> int:
+        if self.DB_POOL_SIZE is not None:
+            return self.DB_POOL_SIZE
+        return max(1, self.db_connections_per_worker * 3 // 4)
+
+    @property
+    def db_max_overflow(self) -> int:
+        if self.DB_MAX_OVERFLOW is not None:
+            return self.DB_MAX_OVERFLOW
+        return max(0, self.db_connections_per_worker - self.db_pool_size)
+
     @property
     def google_redirect_url(self) -> str:
         return f"https://accounts.google.com/o/oauth2/auth?response_type=code&client_id={self.GOOGLE_CLIENT_ID}&redirect_uri={self.GOOGLE_REDIRECT_URI}&scope=openid%20profile%20email&access_type=offline"
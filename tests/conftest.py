@@ -0,0 +1,48 @@
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+
+from database import AsyncSessionFactory, engine
+from models import Base, UserProfile
+from repository import TaskCache
+
+
+@pytest.fixture
+async def redis():
+    """In-memory Redis with Lua support, isolated per test."""
+    client = FakeAsyncRedis(server=FakeServer())
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def task_cache(redis) -> TaskCache:
+    return TaskCache(redis, ttl=300, empty_ttl=60)
+
+
+@pytest.fixture
+async def db():
+    """Schema on the database configured by Settings, skipping if it's unreachable.
+
+    Start it with docker-compose up db.
+    """
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    except (OSError, asyncpg.PostgresError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    yield engine
+    # Pooled connections are bound to the event loop of the test.
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user_id(db) -> UUID:
+    async with AsyncSessionFactory() as session:
+        user = UserProfile(username=f"test-{uuid4()}")
+        session.add(user)
+        await session.commit()
+        return user.user_id
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from client import GoogleClient
+from client.http import create_http_client
+from settings import Settings
+
+
+USER_INFO = {
+    "id": 1234567890,
+    "name": "Test User",
+    "email": "user@example.com",
+    "verified_email": True,
+}
+
+
+class GoogleStub:
+    """Mock transport handler for Google's token and userinfo endpoints.
+
+    The i-th userinfo request waits userinfo_delays[i] seconds, if given.
+    """
+
+    def __init__(self, settings: Settings, userinfo_delays: tuple[float, ...] = ()):
+        self.settings = settings
+        self.userinfo_delays = list(userinfo_delays)
+        self.userinfo_requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if str(request.url) == self.settings.GOOGLE_TOKEN_URL:
+            return httpx.Response(200, json={"access_token": "access"})
+        assert str(request.url) == self.settings.GOOGLE_USERINFO_URL
+        assert request.headers["Authorization"] == "Bearer access"
+        attempt = self.userinfo_requests
+        self.userinfo_requests += 1
+        if attempt < len(self.userinfo_delays):
+            await asyncio.sleep(self.userinfo_delays[attempt])
+        return httpx.Response(200, json={**USER_INFO, "name": f"attempt {attempt}"})
+
+
+def make_client(settings: Settings, stub: GoogleStub) -> GoogleClient:
+    return GoogleClient(
+        settings=settings,
+        async_client=httpx.AsyncClient(transport=httpx.MockTransport(stub)),
+    )
+
+
+async def test_get_user_info_without_hedging():
+    settings = Settings(GOOGLE_USERINFO_HEDGE_DELAY=None)
+    stub = GoogleStub(settings, userinfo_delays=(0.05,))
+
+    user = await make_client(settings, stub).get_user_info("code")
+
+    assert stub.userinfo_requests == 1
+    assert user.email == USER_INFO["email"]
+    assert user.access_token == "access"
+
+
+async def test_fast_response_is_not_hedged():
+    settings = Settings(GOOGLE_USERINFO_HEDGE_DELAY=0.2)
+    stub = GoogleStub(settings)
+
+    user = await make_client(settings, stub).get_user_info("code")
+
+    assert stub.userinfo_requests == 1
+    assert user.name == "attempt 0"
+
+
+async def test_slow_response_is_hedged():
+    settings = Settings(GOOGLE_USERINFO_HEDGE_DELAY=0.05)
+    stub = GoogleStub(settings, userinfo_delays=(5.0,))
+    started = time.monotonic()
+
+    user = await make_client(settings, stub).get_user_info("code")
+
+    assert time.monotonic() - started < 1.0
+    assert stub.userinfo_requests == 2
+    assert user.name == "attempt 1"
+
+
+async def test_hedge_falls_back_to_first_attempt_error():
+    settings = Settings(GOOGLE_USERINFO_HEDGE_DELAY=0.01)
+    attempts = 0
+
+    async def failing(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        attempt = attempts
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectError(f"attempt {attempt}", request=request)
+
+    client = GoogleClient(
+        settings=settings,
+        async_client=httpx.AsyncClient(transport=httpx.MockTransport(failing)),
+    )
+
+    with pytest.raises(httpx.ConnectError, match="attempt 1"):
+        await client._hedged_get(settings.GOOGLE_USERINFO_URL)
+    assert attempts == 2
+
+
+async def test_create_http_client_uses_settings():
+    settings = Settings(
+        HTTP_CONNECT_TIMEOUT=1.5,
+        HTTP_READ_TIMEOUT=2.5,
+        HTTP_WRITE_TIMEOUT=3.5,
+        HTTP_POOL_TIMEOUT=0.5,
+    )
+
+    async with create_http_client(settings) as client:
+        assert client.timeout == httpx.Timeout(
+            connect=1.5, read=2.5, write=3.5, pool=0.5
+        )
@@ -0,0 +1,185 @@
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from client import GoogleClient
+from client.jwks import JwksCache
+from exception import GoogleAuthException
+from settings import Settings
+
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+
+
+class SigningKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def sign(self, access_token: str = "access", **claims) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "user@example.com",
+            "email_verified": True,
+            "name": "Test User",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(
+            claims,
+            self.private_pem,
+            algorithm="RS256",
+            headers={"kid": self.kid},
+            access_token=access_token,
+        )
+
+
+class GoogleStub:
+    """Mock transport handler for Google's token and JWKS endpoints."""
+
+    def __init__(self, settings: Settings, keys: list[SigningKey]):
+        self.settings = settings
+        self.keys = keys
+        self.id_token = None
+        self.jwks_requests = 0
+        self.userinfo_requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url == self.settings.GOOGLE_TOKEN_URL:
+            return httpx.Response(
+                200, json={"access_token": "access", "id_token": self.id_token}
+            )
+        if url == self.settings.GOOGLE_JWKS_URL:
+            self.jwks_requests += 1
+            return httpx.Response(
+                200,
+                json={"keys": [key.jwk for key in self.keys]},
+                headers={"Cache-Control": "public, max-age=600"},
+            )
+        self.userinfo_requests += 1
+        return httpx.Response(500)
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(GOOGLE_CLIENT_ID=CLIENT_ID)
+
+
+@pytest.fixture
+def signing_key() -> SigningKey:
+    return SigningKey("key-1")
+
+
+@pytest.fixture
+def stub(settings, signing_key) -> GoogleStub:
+    return GoogleStub(settings, [signing_key])
+
+
+@pytest.fixture
+def http_client(stub) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(stub))
+
+
+def make_jwks(settings, http_client, redis, **kwargs) -> JwksCache:
+    return JwksCache(http_client, redis, url=settings.GOOGLE_JWKS_URL, **kwargs)
+
+
+def make_client(settings, http_client, jwks) -> GoogleClient:
+    return GoogleClient(settings=settings, async_client=http_client, jwks=jwks)
+
+
+async def test_id_token_is_verified_locally(settings, stub, http_client, redis, signing_key):
+    client = make_client(settings, http_client, make_jwks(settings, http_client, redis))
+
+    for _ in range(3):
+        stub.id_token = signing_key.sign()
+        user = await client.get_user_info("code")
+
+    assert user.id == 1234567890
+    assert user.email == "user@example.com"
+    assert user.verified_email
+    assert user.access_token == "access"
+    assert stub.jwks_requests == 1
+    assert stub.userinfo_requests == 0
+
+
+async def test_keys_are_shared_through_redis(settings, stub, http_client, redis):
+    first_worker = make_jwks(settings, http_client, redis)
+    second_worker = make_jwks(settings, http_client, redis)
+
+    assert await first_worker.get_keys() == await second_worker.get_keys()
+    assert stub.jwks_requests == 1
+    assert 0 < await redis.ttl(first_worker._redis_key) <= 600
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 60},
+    ],
+    ids=["audience", "issuer", "expired"],
+)
+async def test_invalid_claims_are_rejected(settings, stub, http_client, redis, signing_key, claims):
+    client = make_client(settings, http_client, make_jwks(settings, http_client, redis))
+    stub.id_token = signing_key.sign(**claims)
+
+    with pytest.raises(GoogleAuthException):
+        await client.get_user_info("code")
+
+
+async def test_forged_signature_is_rejected(settings, stub, http_client, redis):
+    client = make_client(settings, http_client, make_jwks(settings, http_client, redis))
+    stub.id_token = SigningKey("key-1").sign()
+
+    with pytest.raises(GoogleAuthException):
+        await client.get_user_info("code")
+
+
+async def test_mismatched_access_token_is_rejected(settings, stub, http_client, redis, signing_key):
+    client = make_client(settings, http_client, make_jwks(settings, http_client, redis))
+    stub.id_token = signing_key.sign(access_token="another-access-token")
+
+    with pytest.raises(GoogleAuthException):
+        await client.get_user_info("code")
+
+
+async def test_unknown_key_id_refetches_rotated_keys(settings, stub, http_client, redis):
+    jwks = make_jwks(settings, http_client, redis, min_refetch_interval=0)
+    client = make_client(settings, http_client, jwks)
+    await jwks.get_keys()
+    rotated = SigningKey("key-2")
+    stub.keys.append(rotated)
+    stub.id_token = rotated.sign()
+
+    user = await client.get_user_info("code")
+
+    assert user.email == "user@example.com"
+    assert stub.jwks_requests == 2
+
+
+async def test_unknown_key_id_refetch_is_rate_limited(settings, stub, http_client, redis):
+    jwks = make_jwks(settings, http_client, redis, min_refetch_interval=60)
+    await jwks.get_keys()
+
+    assert await jwks.get_key("unknown") is None
+    assert stub.jwks_requests == 1
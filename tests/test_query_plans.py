@@ -0,0 +1,115 @@
+"""Plan regression tests for the hot lookups.
+
+Each case runs a repository call, captures the SQL it sent and EXPLAINs that
+exact statement with sequential scans and explicit sorts disabled. A tiny
+test table would otherwise be scanned sequentially, or read through any
+index on user_id and sorted, depending on what other tests left in it; this
+way the plan checks that an index matching the query's filter and sort order
+exists.
+"""
+import json
+from typing import Any, Awaitable, Callable
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event
+
+from database import engine
+from repository import TaskRepository, UserRepository
+from schema import TaskQuery, TaskSortField, TaskUpdate
+
+
+USER_ID_INDEXES = (
+    "ix_Tasks_user_id_task_id",
+    "ix_Tasks_user_id_name_task_id",
+    "ix_Tasks_user_id_pomodoro_count_task_id",
+)
+
+
+async def capture_statements(call: Awaitable) -> list[tuple[str, Any]]:
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def plan_indexes(node: dict) -> set[str]:
+    indexes = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", ()):
+        indexes |= plan_indexes(child)
+    return indexes
+
+
+async def explain_indexes(statement: str, parameters: Any) -> set[str]:
+    async with engine.connect() as connection:
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        await connection.exec_driver_sql("SET LOCAL enable_sort = off")
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan_indexes(plan[0]["Plan"])
+
+
+Lookup = Callable[[UUID], Awaitable]
+
+CASES: dict[str, tuple[Lookup, tuple[str, ...]]] = {
+    "user by email": (
+        lambda user_id: UserRepository().get_user_by_email("user@example.com"),
+        ("ix_user_profile_email",),
+    ),
+    "user by google token": (
+        lambda user_id: UserRepository().get_google_user("google-token"),
+        ("ix_user_profile_google_access_token",),
+    ),
+    "user's task list": (
+        lambda user_id: TaskRepository().get_user_task_rows(user_id),
+        USER_ID_INDEXES,
+    ),
+    "page by task_id": (
+        lambda user_id: TaskRepository().get_user_tasks_page(
+            user_id, TaskQuery(limit=10), after=(None, uuid4())
+        ),
+        ("ix_Tasks_user_id_task_id",),
+    ),
+    "page by name": (
+        lambda user_id: TaskRepository().get_user_tasks_page(
+            user_id, TaskQuery(limit=10, sort=TaskSortField.name), after=("name", uuid4())
+        ),
+        ("ix_Tasks_user_id_name_task_id",),
+    ),
+    "page by pomodoro_count, descending": (
+        lambda user_id: TaskRepository().get_user_tasks_page(
+            user_id, TaskQuery(limit=10, sort=TaskSortField.pomodoro_count, order="desc")
+        ),
+        ("ix_Tasks_user_id_pomodoro_count_task_id",),
+    ),
+    "update task": (
+        lambda user_id: TaskRepository().update_task(
+            TaskUpdate(task_id=uuid4(), name="name", pomodoro_count=1), user_id
+        ),
+        ("Tasks_pkey", *USER_ID_INDEXES),
+    ),
+    "delete task": (
+        lambda user_id: TaskRepository().delete_task(uuid4(), user_id),
+        ("Tasks_pkey", *USER_ID_INDEXES),
+    ),
+}
+
+
+@pytest.mark.parametrize("lookup, expected", CASES.values(), ids=CASES.keys())
+async def test_lookup_uses_index(user_id, lookup, expected):
+    statements = await capture_statements(lookup(user_id))
+
+    assert len(statements) == 1
+    indexes = await explain_indexes(*statements[0])
+    assert indexes and indexes <= set(expected), indexes
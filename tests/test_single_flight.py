@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from cache.single_flight import SingleFlight
+from service import TaskService
+
+
+class CountingLoader:
+    def __init__(self, result=None, error: Exception | None = None, delay: float = 0.05):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    loader = CountingLoader(result=42)
+
+    results = await asyncio.gather(*(flight.do("key", loader) for _ in range(50)))
+
+    assert results == [42] * 50
+    assert loader.calls == 1
+    assert not flight.in_flight("key")
+
+
+async def test_different_keys_load_separately():
+    flight = SingleFlight()
+    loader = CountingLoader()
+
+    await asyncio.gather(flight.do("a", loader), flight.do("b", loader))
+
+    assert loader.calls == 2
+
+
+async def test_error_is_shared_and_not_cached():
+    flight = SingleFlight()
+    failing = CountingLoader(error=RuntimeError("boom"))
+
+    results = await asyncio.gather(
+        *(flight.do("key", failing) for _ in range(5)), return_exceptions=True
+    )
+
+    assert failing.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await flight.do("key", CountingLoader(result="ok", delay=0)) == "ok"
+
+
+async def test_cancelling_first_caller_keeps_load_for_others():
+    flight = SingleFlight()
+    loader = CountingLoader(result="value")
+    first = asyncio.create_task(flight.do("key", loader))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(flight.do("key", loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await asyncio.gather(*waiters) == ["value"] * 3
+    assert loader.calls == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+class SlowTaskRepository:
+    """Stands in for TaskRepository and counts database reads."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = 0
+
+    async def get_user_task_rows(self, user_id):
+        self.reads += 1
+        await asyncio.sleep(0.05)
+        return self.rows
+
+
+async def test_concurrent_cache_misses_query_database_once(task_cache):
+    user_id = uuid4()
+    row = {
+        "task_id": uuid4(),
+        "name": "task",
+        "pomodoro_count": 1,
+        "category_id": None,
+        "user_id": user_id,
+    }
+    repository = SlowTaskRepository([SimpleNamespace(**row)])
+    task_service = TaskService(task_repository=repository, task_cache=task_cache)
+
+    results = await asyncio.gather(
+        *(task_service.get_user_tasks(user_id) for _ in range(20))
+    )
+
+    assert repository.reads == 1
+    assert all(len(tasks) == 1 and tasks[0].task_id == row["task_id"] for tasks in results)
+    assert await task_cache.get_user_tasks(user_id) == results[0]
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database import slow_query
+from database.slow_query import _redact_plan_line, install_slow_query_log
+
+
+@pytest.mark.parametrize(
+    "line, redacted",
+    [
+        (
+            "  Index Cond: ((email)::text = 'a@b.c'::text)",
+            "  Index Cond: ((email)::text = '?'::text)",
+        ),
+        (
+            "  Filter: ((pomodoro_count >= 3) AND (name = 'it''s'::text))",
+            "  Filter: ((pomodoro_count >= ?) AND (name = '?'::text))",
+        ),
+        (
+            "Index Scan using ix_Tasks_user_id_task_id on \"Tasks\""
+            "  (cost=0.15..8.17 rows=1 width=92) (actual time=0.011..0.012 rows=0 loops=1)",
+            "Index Scan using ix_Tasks_user_id_task_id on \"Tasks\""
+            "  (cost=0.15..8.17 rows=1 width=92) (actual time=0.011..0.012 rows=0 loops=1)",
+        ),
+        ("  Rows Removed by Filter: 12", "  Rows Removed by Filter: 12"),
+        ("  Buffers: shared hit=3", "  Buffers: shared hit=3"),
+    ],
+    ids=["string", "number", "node", "rows removed", "buffers"],
+)
+def test_plan_values_are_redacted(line, redacted):
+    assert _redact_plan_line(line) == redacted
+
+
+async def test_explained_plan_is_redacted(db, tmp_path):
+    # A separate engine, so the listeners don't outlive the test.
+    engine = create_async_engine(db.url)
+    explain_file = tmp_path / "slow_queries.log"
+    install_slow_query_log(
+        engine, threshold=0, explain_sample_rate=1, explain_file=str(explain_file)
+    )
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(
+                text("SELECT user_id FROM user_profile WHERE email = :email"),
+                {"email": "secret@example.com"},
+            )
+        await asyncio.gather(*slow_query._explain_tasks)
+    finally:
+        await engine.dispose()
+        for handler in logging.getLogger("slow_query.explain").handlers:
+            handler.flush()
+
+    plan = explain_file.read_text()
+    assert "user_profile" in plan
+    assert "email" in plan
+    assert "secret@example.com" not in plan
+    assert not slow_query._explain_tasks
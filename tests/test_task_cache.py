@@ -0,0 +1,236 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+from cache import CompactTaskCodec, JsonTaskCodec, start_request_cache_stats
+from repository import TaskCache
+from schema import TaskQuery, TaskResponse
+from service import TaskService
+
+
+def make_task(user_id: UUID, name: str = "task", pomodoro_count: int = 1) -> TaskResponse:
+    return TaskResponse(
+        task_id=uuid4(),
+        name=name,
+        pomodoro_count=pomodoro_count,
+        category_id=None,
+        user_id=user_id,
+    )
+
+
+@pytest.fixture
+def user_id() -> UUID:
+    return uuid4()
+
+
+@pytest.fixture
+def round_trips(redis, monkeypatch) -> list:
+    """Records every packet sent to Redis; a pipeline or script call is one."""
+    sent = []
+    connection_class = redis.connection_pool.connection_class
+    send_packed_command = connection_class.send_packed_command
+
+    async def recording_send(self, command, *args, **kwargs):
+        sent.append(command)
+        return await send_packed_command(self, command, *args, **kwargs)
+
+    monkeypatch.setattr(connection_class, "send_packed_command", recording_send)
+    return sent
+
+
+@pytest.mark.parametrize(
+    "codec", [JsonTaskCodec(), CompactTaskCodec(compress_threshold=0)], ids=["json", "compact"]
+)
+async def test_set_users_task_round_trip(redis, user_id, codec):
+    task_cache = TaskCache(redis, codec=codec)
+    tasks = [make_task(user_id, name=f"task {i}", pomodoro_count=i) for i in range(5)]
+
+    assert await task_cache.set_users_task(user_id=user_id, tasks=tasks)
+
+    assert await task_cache.get_user_tasks(user_id) == tasks
+
+
+@pytest.mark.parametrize(
+    "writer, reader",
+    [(JsonTaskCodec(), CompactTaskCodec()), (CompactTaskCodec(), JsonTaskCodec())],
+    ids=["json-read-as-compact", "compact-read-as-json"],
+)
+async def test_entries_of_another_codec_are_misses(redis, user_id, writer, reader):
+    writer_cache = TaskCache(redis, codec=writer)
+    await writer_cache.set_users_task(user_id=user_id, tasks=[make_task(user_id)])
+    task_cache = TaskCache(redis, codec=reader)
+
+    assert (await task_cache.lookup_user_tasks_json(user_id)).payload is None
+    assert await task_cache.get_user_tasks(user_id) is None
+
+
+async def test_set_users_task_replaces_previous_list(task_cache, redis, user_id):
+    await task_cache.set_users_task(user_id=user_id, tasks=[make_task(user_id), make_task(user_id)])
+    replacement = [make_task(user_id, name="only")]
+
+    await task_cache.set_users_task(user_id=user_id, tasks=replacement)
+
+    assert await task_cache.get_user_tasks(user_id) == replacement
+    assert await redis.hlen(task_cache._hash_key(user_id)) == 1
+    assert await redis.zcard(task_cache._order_key(user_id)) == 1
+
+
+async def test_set_users_task_expires_list(task_cache, redis, user_id):
+    await task_cache.set_users_task(user_id=user_id, tasks=[make_task(user_id)], recompute_time=0.01)
+
+    for key in (
+        task_cache._hash_key(user_id),
+        task_cache._order_key(user_id),
+        task_cache._meta_key(user_id),
+    ):
+        assert 0 < await redis.ttl(key) <= task_cache.ttl
+
+
+async def test_empty_list_is_cached_as_marker(task_cache, redis, user_id):
+    await task_cache.set_users_task(user_id=user_id, tasks=[make_task(user_id)])
+
+    await task_cache.set_users_task(user_id=user_id, tasks=[])
+
+    assert await task_cache.get_user_tasks(user_id) == []
+    assert not await redis.exists(task_cache._hash_key(user_id))
+    assert 0 < await redis.ttl(task_cache._empty_key(user_id)) <= task_cache.empty_ttl
+
+
+async def test_get_user_tasks_misses_when_nothing_cached(task_cache, user_id):
+    assert await task_cache.get_user_tasks(user_id) is None
+
+
+async def test_apply_changes_patches_cached_list(task_cache, user_id):
+    first, second, third = (make_task(user_id, name=name) for name in "abc")
+    await task_cache.set_users_task(user_id=user_id, tasks=[first, second, third])
+    updated = first.model_copy(update={"name": "renamed"})
+    created = make_task(user_id, name="d")
+
+    patched = await task_cache.apply_changes(
+        user_id=user_id, upserted=[updated, created], removed=[second.task_id]
+    )
+
+    assert patched
+    assert await task_cache.get_user_tasks(user_id) == [updated, third, created]
+
+
+async def test_apply_changes_skips_uncached_user(task_cache, redis, user_id):
+    patched = await task_cache.apply_changes(user_id=user_id, upserted=[make_task(user_id)])
+
+    assert not patched
+    assert await task_cache.get_user_tasks(user_id) is None
+    assert not await redis.exists(task_cache._hash_key(user_id))
+
+
+async def test_removing_last_task_caches_empty_marker(task_cache, user_id):
+    task = make_task(user_id)
+    await task_cache.set_users_task(user_id=user_id, tasks=[task])
+
+    await task_cache.remove_task(user_id=user_id, task_id=task.task_id)
+
+    assert await task_cache.get_user_tasks(user_id) == []
+
+
+async def test_add_task_to_empty_marker(task_cache, user_id):
+    await task_cache.set_users_task(user_id=user_id, tasks=[])
+    task = make_task(user_id)
+
+    assert await task_cache.add_task(user_id=user_id, task=task)
+
+    assert await task_cache.get_user_tasks(user_id) == [task]
+
+
+async def test_invalidate_user_cache(task_cache, user_id):
+    await task_cache.set_users_task(user_id=user_id, tasks=[make_task(user_id)])
+
+    await task_cache.invalidate_user_cache(user_id)
+
+    assert await task_cache.get_user_tasks(user_id) is None
+
+
+async def test_rebuild_racing_a_write_is_not_stored(task_cache, user_id):
+    version = await task_cache.get_version(user_id)
+    stale = [make_task(user_id, name="before the write")]
+    await task_cache.apply_changes(user_id=user_id, upserted=[make_task(user_id)])
+
+    stored = await task_cache.set_users_task(user_id=user_id, tasks=stale, version=version)
+
+    assert not stored
+    assert await task_cache.get_user_tasks(user_id) is None
+
+
+async def test_rebuild_without_racing_write_is_stored(task_cache, user_id):
+    await task_cache.invalidate_user_cache(user_id)
+    version = await task_cache.get_version(user_id)
+    tasks = [make_task(user_id)]
+
+    assert await task_cache.set_users_task(user_id=user_id, tasks=tasks, version=version)
+
+    assert await task_cache.get_user_tasks(user_id) == tasks
+
+
+async def test_page_read_racing_a_write_is_not_stored(task_cache, user_id):
+    version = await task_cache.get_version(user_id)
+    await task_cache.apply_changes(user_id=user_id, upserted=[make_task(user_id)])
+
+    stored = await task_cache.set_page(user_id, "page", b"stale", version=version)
+
+    assert not stored
+    assert await task_cache.get_page(user_id, "page") is None
+
+
+async def test_page_read_without_racing_write_is_stored(task_cache, user_id):
+    version = await task_cache.get_version(user_id)
+
+    assert await task_cache.set_page(user_id, "page", b"page", version=version)
+
+    assert await task_cache.get_page(user_id, "page") == b"page"
+
+
+async def test_service_does_not_cache_page_read_before_a_write(task_cache, user_id):
+    stale = make_task(user_id, name="before the write")
+
+    class RacingTaskRepository:
+        async def get_user_tasks_page(self, user_id, query, after):
+            await task_cache.apply_changes(
+                user_id=user_id, upserted=[stale.model_copy(update={"name": "renamed"})]
+            )
+            return [stale]
+
+    task_service = TaskService(task_repository=RacingTaskRepository(), task_cache=task_cache)
+    query = TaskQuery(limit=10)
+
+    page = await task_service.get_user_tasks_page(user_id, query)
+
+    assert page.items == [stale]
+    assert not await task_cache.aioredis.exists(task_cache._pages_key(user_id))
+
+
+@pytest.mark.parametrize(
+    "write",
+    ["set_users_task", "add_task", "update_task", "remove_task", "apply_changes", "invalidate"],
+)
+async def test_write_is_one_round_trip(task_cache, user_id, round_trips, write):
+    first, second = make_task(user_id), make_task(user_id)
+    await task_cache.set_users_task(user_id=user_id, tasks=[first, second])
+    # The first script call loads the script into Redis.
+    await task_cache.apply_changes(user_id=user_id)
+    writes = {
+        "set_users_task": lambda: task_cache.set_users_task(user_id=user_id, tasks=[first]),
+        "add_task": lambda: task_cache.add_task(user_id=user_id, task=make_task(user_id)),
+        "update_task": lambda: task_cache.update_task(
+            user_id=user_id, task=first.model_copy(update={"name": "renamed"})
+        ),
+        "remove_task": lambda: task_cache.remove_task(user_id=user_id, task_id=second.task_id),
+        "apply_changes": lambda: task_cache.apply_changes(
+            user_id=user_id, upserted=[make_task(user_id), first], removed=[second.task_id]
+        ),
+        "invalidate": lambda: task_cache.invalidate_user_cache(user_id),
+    }
+    round_trips.clear()
+    stats = start_request_cache_stats()
+
+    await writes[write]()
+
+    assert stats.commands == 1
+    assert len(round_trips) == 1
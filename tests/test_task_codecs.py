@@ -0,0 +1,54 @@
+import zlib
+from uuid import uuid4
+
+import pytest
+
+from cache import CompactTaskCodec, JsonTaskCodec
+from schema import TaskResponse
+
+
+@pytest.fixture
+def task() -> TaskResponse:
+    return TaskResponse(
+        task_id=uuid4(),
+        name="Write the quarterly report",
+        pomodoro_count=3,
+        category_id=uuid4(),
+        user_id=uuid4(),
+    )
+
+
+def test_compact_task_is_smaller_than_json(task):
+    compact = CompactTaskCodec().encode_task(task)
+    document = JsonTaskCodec().encode_task(task)
+
+    assert len(compact) < 0.75 * len(document)
+    assert CompactTaskCodec().decode_task_json(compact) == document
+
+
+def test_compact_task_below_threshold_is_stored_uncompressed(task):
+    codec = CompactTaskCodec(compress_threshold=1024)
+    document = task.model_dump_json().encode("utf-8")
+
+    payload = codec.encode_task(task)
+
+    assert payload == codec.MAGIC + bytes((codec.VERSION, 0)) + document
+    assert codec.decode_task_json(payload) == document
+
+
+@pytest.mark.parametrize(
+    "flags, compress", [(0, bytes), (CompactTaskCodec.FLAG_ZLIB, zlib.compress)], ids=["plain", "zlib"]
+)
+def test_compact_reads_version_1(task, flags, compress):
+    document = task.model_dump_json().encode("utf-8")
+    payload = CompactTaskCodec.MAGIC + bytes((1, flags)) + compress(document)
+
+    assert CompactTaskCodec().decode_task_json(payload) == document
+
+
+def test_compact_skips_unknown_version(task):
+    codec = CompactTaskCodec()
+    payload = codec.encode_task(task)
+    newer = codec.MAGIC + bytes((codec.VERSION + 1,)) + payload[len(codec.MAGIC) + 1 :]
+
+    assert codec.decode_task_json(newer) is None
@@ -0,0 +1,163 @@
+import csv
+import io
+import tracemalloc
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+
+from database import AsyncAutocommitSessionFactory, AsyncReplicaSessionFactory, UnitOfWork
+from repository import TaskRepository
+from schema import TaskCreate, TaskResponse
+from service import TaskService
+from settings import settings
+
+
+class StreamingTaskRepository:
+    """Stands in for TaskRepository and records the requested batch size."""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.batch_size = None
+
+    async def stream_user_tasks(self, user_id, batch_size):
+        self.batch_size = batch_size
+        for task in self.tasks:
+            yield task
+
+
+class SyntheticTaskRepository:
+    """Stands in for TaskRepository and generates every task on the fly."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    async def stream_user_tasks(self, user_id, batch_size):
+        for i in range(self.count):
+            yield SimpleNamespace(
+                task_id=UUID(int=i),
+                name=f"task {i}",
+                pomodoro_count=i % 8,
+                category_id=None,
+                user_id=user_id,
+            )
+
+
+def make_tasks(user_id, count: int):
+    return [
+        SimpleNamespace(
+            task_id=uuid4(),
+            name=f'task "{i}", with comma',
+            pomodoro_count=i,
+            category_id=None,
+            user_id=user_id,
+        )
+        for i in range(count)
+    ]
+
+
+async def export(task_service: TaskService, user_id, export_format) -> list[bytes]:
+    return [chunk async for chunk in task_service.export_user_tasks(user_id, export_format)]
+
+
+@pytest.fixture
+def batch_size(monkeypatch) -> int:
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    return 2
+
+
+async def test_ndjson_export(task_cache, batch_size):
+    user_id = uuid4()
+    tasks = make_tasks(user_id, 5)
+    repository = StreamingTaskRepository(tasks)
+    task_service = TaskService(task_repository=repository, task_cache=task_cache)
+
+    chunks = await export(task_service, user_id, "ndjson")
+
+    assert repository.batch_size == batch_size
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [TaskResponse.model_validate_json(line) for line in lines] == [
+        TaskResponse.model_validate(task) for task in tasks
+    ]
+
+
+async def test_csv_export(task_cache, batch_size):
+    user_id = uuid4()
+    tasks = make_tasks(user_id, 4)
+    task_service = TaskService(
+        task_repository=StreamingTaskRepository(tasks), task_cache=task_cache
+    )
+
+    chunks = await export(task_service, user_id, "csv")
+
+    assert len(chunks) == 2
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [row["name"] for row in rows] == [task.name for task in tasks]
+    assert [row["task_id"] for row in rows] == [str(task.task_id) for task in tasks]
+    assert list(rows[0]) == list(TaskResponse.model_fields)
+
+
+async def test_export_of_user_without_tasks(task_cache):
+    task_service = TaskService(
+        task_repository=StreamingTaskRepository([]), task_cache=task_cache
+    )
+
+    assert await export(task_service, uuid4(), "ndjson") == []
+
+
+@pytest.mark.parametrize("export_format, count", [("ndjson", 1_000_000), ("csv", 200_000)])
+async def test_export_memory_is_bounded(task_cache, export_format, count):
+    """Peak memory of an export stays within a few batches, however many rows it has."""
+    task_service = TaskService(
+        task_repository=SyntheticTaskRepository(count), task_cache=task_cache
+    )
+    exported = 0
+
+    tracemalloc.start()
+    try:
+        async for chunk in task_service.export_user_tasks(uuid4(), export_format):
+            exported += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert exported > 10 * 1024 * 1024
+    assert peak < 4 * 1024 * 1024
+
+
+async def test_stream_user_tasks_reads_in_batches(user_id):
+    repository = TaskRepository()
+    created = [
+        await repository.create_task(TaskCreate(name=f"task {i}", pomodoro_count=i), user_id)
+        for i in range(5)
+    ]
+
+    streamed = [task async for task in repository.stream_user_tasks(user_id, batch_size=2)]
+
+    assert [task.task_id for task in streamed] == sorted(task.task_id for task in created)
+
+
+@pytest.mark.parametrize(
+    "session_factory",
+    [AsyncReplicaSessionFactory, AsyncAutocommitSessionFactory],
+    ids=["replica", "autocommit"],
+)
+async def test_stream_user_tasks_uses_injected_unit_of_work(user_id, session_factory):
+    opened = []
+
+    def recording_session_factory():
+        session = session_factory()
+        opened.append(session)
+        return session
+
+    unit_of_work = UnitOfWork(recording_session_factory)
+    await TaskRepository().create_task(TaskCreate(name="task", pomodoro_count=1), user_id)
+    try:
+        repository = TaskRepository(unit_of_work=unit_of_work, read_unit_of_work=unit_of_work)
+        streamed = [task async for task in repository.stream_user_tasks(user_id, batch_size=2)]
+    finally:
+        await unit_of_work.close()
+
+    assert [task.name for task in streamed] == ["task"]
+    assert len(opened) == 2
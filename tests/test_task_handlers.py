@@ -0,0 +1,103 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from dependency import (
+    get_container,
+    get_readonly_task_service,
+    get_request_user_id,
+    get_settings,
+    get_task_service,
+)
+from exception import InvalidCursorException
+from handlers.tasks import router
+from schema import TaskPage
+from settings import Settings
+
+
+class RecordingTaskService:
+    """Stands in for TaskService and records which read path was taken."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_user_tasks_json(self, user_id):
+        self.calls.append("json")
+        return b"[]"
+
+    async def get_user_tasks_page(self, user_id, query):
+        self.calls.append(("page", query))
+        if query.cursor == "bad":
+            raise InvalidCursorException
+        return TaskPage(items=[], next_cursor=None)
+
+    async def bulk_write(self, bulk, user_id):
+        self.calls.append("bulk")
+        raise AssertionError("bulk_write must not be reached")
+
+
+@pytest.fixture
+def task_service() -> RecordingTaskService:
+    return RecordingTaskService()
+
+
+@pytest.fixture
+async def client(task_service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides = {
+        get_container: lambda: None,
+        get_settings: lambda: Settings(RATE_LIMIT_ENABLED=False),
+        get_request_user_id: lambda: uuid4(),
+        get_task_service: lambda: task_service,
+        get_readonly_task_service: lambda: task_service,
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_list_without_query_returns_full_list(client, task_service):
+    response = await client.get("/task/all")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert task_service.calls == ["json"]
+
+
+@pytest.mark.parametrize("params", [{"limit": 10}, {"sort": "task_id"}, {"order": "asc"}])
+async def test_any_query_parameter_returns_page(client, task_service, params):
+    response = await client.get("/task/all", params=params)
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+    assert [call[0] for call in task_service.calls] == ["page"]
+
+
+async def test_unknown_query_parameter_returns_full_list(client, task_service):
+    response = await client.get("/task/all", params={"utm_source": "mail"})
+
+    assert response.status_code == 200
+    assert task_service.calls == ["json"]
+
+
+async def test_invalid_cursor_is_bad_request(client):
+    response = await client.get("/task/all", params={"cursor": "bad"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("field", ["update", "delete"])
+async def test_bulk_write_rejects_duplicate_ids(client, task_service, field):
+    task_id = str(uuid4())
+    items = {
+        "update": [{"task_id": task_id, "name": "a", "pomodoro_count": 1}] * 2,
+        "delete": [task_id, task_id],
+    }[field]
+
+    response = await client.post("/task/bulk", json={field: items})
+
+    assert response.status_code == 422
+    assert task_service.calls == []
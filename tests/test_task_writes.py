@@ -0,0 +1,109 @@
+from typing import Awaitable
+from uuid import uuid4
+
+import pytest
+
+from database import UnitOfWork, start_request_db_stats
+from exception import TaskNotFoundException
+from repository import TaskRepository
+from schema import TaskBulkRequest, TaskCreate, TaskUpdate
+from service import TaskService
+
+
+async def count_statements(write: Awaitable, unit_of_work: UnitOfWork):
+    """Run a write and commit it, returning its result and the number of SQL statements."""
+    stats = start_request_db_stats()
+    result = await write
+    await unit_of_work.commit()
+    return result, stats.statements
+
+
+@pytest.fixture
+async def unit_of_work(db):
+    unit_of_work = UnitOfWork()
+    yield unit_of_work
+    await unit_of_work.close()
+
+
+@pytest.fixture
+def task_service(unit_of_work, task_cache) -> TaskService:
+    return TaskService(
+        task_repository=TaskRepository(unit_of_work=unit_of_work),
+        task_cache=task_cache,
+        unit_of_work=unit_of_work,
+    )
+
+
+async def create_task(user_id, name: str = "task"):
+    return await TaskRepository().create_task(
+        TaskCreate(name=name, pomodoro_count=1), user_id
+    )
+
+
+async def test_create_task_is_one_statement(task_service, unit_of_work, user_id):
+    task, statements = await count_statements(
+        task_service.create_task(TaskCreate(name="new", pomodoro_count=2), user_id),
+        unit_of_work,
+    )
+
+    assert statements == 1
+    assert task.name == "new" and task.user_id == user_id
+
+
+async def test_update_task_is_one_statement(task_service, unit_of_work, user_id):
+    task = await create_task(user_id)
+
+    updated, statements = await count_statements(
+        task_service.update_task(
+            TaskUpdate(task_id=task.task_id, name="renamed", pomodoro_count=3), user_id
+        ),
+        unit_of_work,
+    )
+
+    assert statements == 1
+    assert updated.name == "renamed" and updated.pomodoro_count == 3
+
+
+async def test_delete_task_is_one_statement(task_service, unit_of_work, user_id):
+    task = await create_task(user_id)
+
+    _, statements = await count_statements(
+        task_service.delete_task(task_id=task.task_id, user_id=user_id), unit_of_work
+    )
+
+    assert statements == 1
+    assert await TaskRepository().get_task_by_id(task.task_id) is None
+
+
+async def test_update_of_foreign_task_is_one_statement(task_service, unit_of_work, user_id):
+    task = await create_task(user_id)
+    stats = start_request_db_stats()
+
+    with pytest.raises(TaskNotFoundException):
+        await task_service.update_task(
+            TaskUpdate(task_id=task.task_id, name="stolen", pomodoro_count=0), uuid4()
+        )
+
+    assert stats.statements == 1
+
+
+async def test_bulk_write_is_one_statement_per_kind(task_service, unit_of_work, user_id):
+    to_update = await create_task(user_id, name="old")
+    to_delete = await create_task(user_id)
+    bulk = TaskBulkRequest(
+        create=[TaskCreate(name=f"new {i}", pomodoro_count=i) for i in range(10)],
+        update=[
+            TaskUpdate(task_id=to_update.task_id, name="updated", pomodoro_count=5),
+            TaskUpdate(task_id=uuid4(), name="missing", pomodoro_count=0),
+        ],
+        delete=[to_delete.task_id, uuid4()],
+    )
+
+    response, statements = await count_statements(
+        task_service.bulk_write(bulk, user_id), unit_of_work
+    )
+
+    assert statements == 3
+    assert [item.status for item in response.items] == (
+        ["created"] * 10 + ["updated", "not_found", "deleted", "not_found"]
+    )